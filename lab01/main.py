@@ -1,4 +1,80 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import math
+import mmap
+import os
 import re
+import struct
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+
+# Класи символів (бітові прапорці) для однопрохідного аналізу структури
+LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+SPECIAL_CHARS = '!@#$%^&*()_+-=[]{};:\'",.<>/?\\|'
+
+# Клас кожного ASCII-символу; решта символів - цифра, якщо isdecimal() (як \d у re)
+_ASCII_CLASSES = {}
+for _code in range(128):
+    _ch = chr(_code)
+    if 'a' <= _ch <= 'z':
+        _ASCII_CLASSES[_ch] = LOWER
+    elif 'A' <= _ch <= 'Z':
+        _ASCII_CLASSES[_ch] = UPPER
+    elif '0' <= _ch <= '9':
+        _ASCII_CLASSES[_ch] = DIGIT
+    elif _ch in SPECIAL_CHARS:
+        _ASCII_CLASSES[_ch] = SPECIAL
+    else:
+        _ASCII_CLASSES[_ch] = 0
+
+
+def _structure_from_classes(flags):
+    score = 0
+    if flags & LOWER and flags & UPPER:
+        score += 1
+    if flags & DIGIT:
+        score += 1
+    if flags & SPECIAL:
+        score += 1
+    types = bool(flags & (LOWER | UPPER)) + bool(flags & DIGIT) + bool(flags & SPECIAL)
+    if types >= 3:
+        score += 1
+    return score
+
+
+# Бал структури для кожної з 16 комбінацій класів
+_STRUCTURE_BY_CLASSES = tuple(_structure_from_classes(f) for f in range(16))
+
+
+def char_classes(pw):
+    """Класи символів пароля (OR прапорців) за один прохід"""
+    flags = 0
+    for ch in set(pw):
+        cls = _ASCII_CLASSES.get(ch)
+        if cls is None:
+            cls = DIGIT if ch.isdecimal() else 0
+        flags |= cls
+    return flags
+
+
+@lru_cache(maxsize=None)
+def _class_table():
+    """Таблиця класів для всіх кодових точок Unicode (для векторного режиму)"""
+    table = np.zeros(0x110000, dtype=np.uint8)
+    for ch, cls in _ASCII_CLASSES.items():
+        table[ord(ch)] = cls
+    all_chars = np.arange(0x110000, dtype=np.uint32).view('<U1')
+    table[np.char.isdecimal(all_chars) & (table == 0)] = DIGIT
+    return table
 
 
 # Функції оцінювання пароля
@@ -10,50 +86,407 @@ def structure_score(pw):
     1 бал — наявність спецсимволів
     1 бал — використано >=3 типи символів
     """
-    score = 0
-    # Великий і малий регістр
-    if re.search(r'[a-z]', pw) and re.search(r'[A-Z]', pw):
-        score += 1
-    # Цифри
-    if re.search(r'\d', pw):
-        score += 1
-    # Спецсимволи
-    if re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>/?\\|]', pw):
-        score += 1
-    # Використано >=3 типи символів
-    types = sum([bool(re.search(r'[a-zA-Z]', pw)),
-                 bool(re.search(r'\d', pw)),
-                 bool(re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>/?\\|]', pw))])
-    if types >= 3:
-        score += 1
-    return score
+    return _STRUCTURE_BY_CLASSES[char_classes(pw)]
+
+def structure_scores(passwords, block=65_536):
+    """
+    Векторна оцінка структури для списку або масиву NumPy паролів
+    Повертає масив балів (0-4), ідентичних structure_score
+    """
+    passwords = np.asarray(passwords, dtype=str).reshape(-1)
+    table = _class_table()
+    lut = np.array(_STRUCTURE_BY_CLASSES, dtype=np.int8)
+    scores = np.empty(len(passwords), dtype=np.int8)
+    for start in range(0, len(passwords), block):
+        part = np.ascontiguousarray(passwords[start:start + block])
+        codes = part.view(np.uint32).reshape(len(part), -1)
+        flags = np.bitwise_or.reduce(table[codes], axis=1)
+        scores[start:start + block] = lut[flags]
+    return scores
+
+# Теги збігів у словниках (бітові прапорці)
+COMMON, NAME, DATE = 1, 2, 4
+COMMON_PATTERNS = ['1234', 'qwerty', 'password', 'abcd']
+
+# Скомпільований автомат: заголовок і плоскі масиви (кожен вирівняний на 8 байтів)
+DICT_SUFFIX = ".acm"
+DICT_MAGIC = b"ACM2"
+_DICT_HEADER = struct.Struct("=4sIQQ")   # магія, теги always, станів, переходів
+
+
+def _dict_layout(states, edges):
+    """
+    Розташування масивів автомата у буфері: [(зміщення, формат, довжина)]
+    та загальний розмір. Переходи у форматі CSR: переходи стану s -
+    labels/targets[offsets[s]:offsets[s + 1]], відсортовані за кодом символу.
+    """
+    layout, pos = [], _DICT_HEADER.size
+    for fmt, count in (("q", states + 1),   # offsets
+                       ("I", edges),        # labels - коди символів
+                       ("I", edges),        # targets - стани переходів
+                       ("I", states),       # fail - суфіксні посилання
+                       ("B", states)):      # out - теги шаблонів стану
+        layout.append((pos, fmt, count))
+        pos += -(-struct.calcsize(fmt) * count // 8) * 8
+    return layout, pos
+
+
+class PatternMatcher:
+    """
+    Автомат Ахо-Корасік для пошуку багатьох шаблонів за один прохід
+    Кожен шаблон має тег (COMMON/NAME/DATE); scan повертає OR тегів
+    усіх шаблонів, що входять у текст.
+    add наповнює дерево шаблонів, build перетворює його на плоскі масиви
+    (див. _dict_layout) - ті самі, що зберігає save. load відкриває файл
+    через mmap, тому процеси пакетного аудиту ділять сторінки словника.
+    """
+
+    def __init__(self):
+        self._goto = [{}]     # дерево шаблонів: символ -> стан
+        self._out = [0]       # теги шаблонів, що закінчуються у стані
+        self.always = 0       # теги порожніх шаблонів (входять у будь-який текст)
+
+    def add(self, pattern, tag):
+        if not pattern:
+            self.always |= tag
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._out.append(0)
+            state = nxt
+        self._out[state] |= tag
+
+    def build(self):
+        """Побудова суфіксних посилань обходом у ширину та пакування в масиви"""
+        goto, out = self._goto, self._out
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+
+        states, edges = len(goto), sum(len(g) for g in goto)
+        layout, size = _dict_layout(states, edges)
+        buf = bytearray(size)
+        _DICT_HEADER.pack_into(buf, 0, DICT_MAGIC, self.always, states, edges)
+        offsets, labels, targets, fail_arr, out_arr = (
+            np.frombuffer(buf, fmt, count, pos) for pos, fmt, count in layout)
+        offsets[1:] = np.cumsum([len(g) for g in goto])
+        order = [sorted(g.items()) for g in goto]
+        labels[:] = np.fromiter((ord(ch) for items in order for ch, _ in items), np.uint32, edges)
+        targets[:] = np.fromiter((nxt for items in order for _, nxt in items), np.uint32, edges)
+        fail_arr[:] = fail
+        out_arr[:] = out
+        del offsets, labels, targets, fail_arr, out_arr, order
+        self._goto = self._out = None
+        self._attach(buf)
+        return self
+
+    def _attach(self, buf, path="<memory>"):
+        if len(buf) < _DICT_HEADER.size:
+            raise ValueError(f"{path}: не є файлом словника")
+        magic, self.always, states, edges = _DICT_HEADER.unpack_from(buf)
+        if magic != DICT_MAGIC:
+            raise ValueError(f"{path}: не є файлом словника")
+        layout, size = _dict_layout(states, edges)
+        if len(buf) < size:
+            raise ValueError(f"{path}: файл словника пошкоджений")
+        view = memoryview(buf)
+        self.offsets, self.labels, self.targets, self.fail, self.out = (
+            view[pos:pos + struct.calcsize(fmt) * count].cast(fmt)
+            for pos, fmt, count in layout)
+        self._buf = buf
+
+    def step(self, state, code):
+        """Перехід зі стану state за кодом символу code"""
+        offsets, labels = self.offsets, self.labels
+        while True:
+            lo, hi = offsets[state], offsets[state + 1]
+            i = bisect_left(labels, code, lo, hi)
+            if i < hi and labels[i] == code:
+                return self.targets[i]
+            if not state:
+                return 0
+            state = self.fail[state]
+
+    def scan(self, text):
+        return scan_all(text, (self,))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self._buf)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        matcher = cls()
+        matcher._goto = matcher._out = None
+        matcher._attach(mm, path)
+        return matcher
+
+    # memoryview не серіалізується: процесам передається копія буфера
+    def __getstate__(self):
+        return bytes(self._buf)
+
+    def __setstate__(self, buf):
+        self._goto = self._out = None
+        self._attach(buf)
+
+
+def scan_all(text, matchers):
+    """Один прохід по тексту одразу всіма автоматами; повертає OR тегів"""
+    hits = 0
+    for m in matchers:
+        hits |= m.always
+    states = [0] * len(matchers)
+    for ch in text:
+        code = ord(ch)
+        for i, m in enumerate(matchers):
+            s = m.step(states[i], code)
+            states[i] = s
+            hits |= m.out[s]
+    return hits
+
+
+def build_dictionary(paths=(), tag=COMMON):
+    """
+    Словник простих шаблонів: вбудовані COMMON_PATTERNS та рядки
+    текстових файлів (розкладки клавіатури, злиті паролі, імена)
+    """
+    matcher = PatternMatcher()
+    for p in COMMON_PATTERNS:
+        matcher.add(p, tag)
+    for path in paths:
+        if path.endswith(DICT_SUFFIX):
+            raise ValueError(f"{path}: скомпільований словник, а не текстовий файл")
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                pattern = line.rstrip("\n").lower()
+                if pattern:
+                    matcher.add(pattern, tag)
+    return matcher.build()
+
+
+def load_dictionary(paths=()):
+    """
+    Словники шаблонів для safety_score (кортеж автоматів): кожен
+    скомпільований *.acm відкривається через mmap, текстові файли
+    збираються в один автомат разом із COMMON_PATTERNS
+    """
+    paths = list(paths)
+    matchers = [PatternMatcher.load(p) for p in paths if p.endswith(DICT_SUFFIX)]
+    text_paths = [p for p in paths if not p.endswith(DICT_SUFFIX)]
+    if text_paths or not matchers:
+        matchers.append(build_dictionary(text_paths))
+    return tuple(matchers)
+
+
+# Транслітерація українських літер латиницею (КМУ 2010);
+# на початку слова є, ї, й, ю, я записуються як ye, yi, y, yu, ya
+TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ie', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia', "'": '', '’': '',
+}
+TRANSLIT_INITIAL = {'є': 'ye', 'ї': 'yi', 'й': 'y', 'ю': 'yu', 'я': 'ya'}
+PROFILE_CACHE = 1024    # кількість підготовлених профілів у LRU-кеші
+
+
+def transliterate(text, initial=True):
+    """Латинський запис тексту; initial=False - без правила початку слова"""
+    result = []
+    for i, ch in enumerate(text):
+        if initial and i == 0 and ch in TRANSLIT_INITIAL:
+            result.append(TRANSLIT_INITIAL[ch])
+        else:
+            result.append(TRANSLIT.get(ch, ch))
+    return ''.join(result)
+
+
+class UserProfile:
+    """
+    Персональні дані користувача, підготовлені один раз для багатьох паролів
+    name_forms - ім'я, його транслітерації та записи задом наперед,
+    date_parts - день, місяць, рік, 2 цифри року та рік задом наперед.
+    Усі фрагменти зібрані в автомат matcher (теги NAME та DATE).
+    """
+
+    def __init__(self, name, birth):
+        self.name = name
+        self.birth = birth
+
+        name_lower = name.lower()
+        forms = {name_lower, transliterate(name_lower), transliterate(name_lower, initial=False)}
+        self.name_forms = sorted(forms | {f[::-1] for f in forms})
+
+        day, month, year = re.findall(r'\d+', birth)
+        self.date_parts = [day, month, year, year[-2:], year[::-1]]
+
+        matcher = PatternMatcher()
+        for form in self.name_forms:
+            matcher.add(form, NAME)
+        for part in self.date_parts:
+            matcher.add(part, DATE)
+        self.matcher = matcher.build()
 
-def safety_score(pw, name, birth):
+    def __repr__(self):
+        return f"UserProfile({self.name!r}, {self.birth!r})"
+
+
+@lru_cache(maxsize=PROFILE_CACHE)
+def get_profile(name, birth):
+    """Профіль користувача з LRU-кешу (ключ - ім'я та дата народження)"""
+    return UserProfile(name, birth)
+
+
+def _as_profile(name, birth):
+    return name if isinstance(name, UserProfile) else get_profile(name, birth)
+
+
+DEFAULT_DICTIONARY = build_dictionary()
+
+
+# Фільтр Блума злитих паролів (файл на диску, відкривається через mmap)
+BLOOM_MAGIC = b"PWBLOOM1"
+_BLOOM_HEADER = struct.Struct("<8sQQI16s")   # магія, біти m, записів n, хешів k, алгоритм
+BLOOM_OFFSET = 64                            # початок бітового масиву у файлі
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Ймовірнісна множина хешів злитих паролів
+    Бітовий масив відкривається через mmap лише для читання, тому процеси
+    пакетного аудиту спільно використовують ті самі сторінки кешу ОС.
+    Позиції бітів: (h1 + i*h2) mod 2^64 mod m, де h1, h2 - перші 16 байтів хешу.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.m, self.n, self.k, algo = _BLOOM_HEADER.unpack_from(self._mm)
+        if magic != BLOOM_MAGIC:
+            raise ValueError(f"{path}: не є файлом фільтра Блума")
+        self.algo = algo.rstrip(b"\0").decode("ascii")
+
+    def contains_digest(self, digest):
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big")
+        mm, m = self._mm, self.m
+        for i in range(self.k):
+            pos = ((h1 + i * h2) & _MASK64) % m
+            if not mm[BLOOM_OFFSET + (pos >> 3)] >> (pos & 7) & 1:
+                return False
+        return True
+
+    def __contains__(self, password):
+        return self.contains_digest(hashlib.new(self.algo, password.encode("utf-8")).digest())
+
+    @property
+    def size_bytes(self):
+        return BLOOM_OFFSET + (self.m + 7) // 8
+
+    @property
+    def false_positive_rate(self):
+        """Очікувана частка хибних збігів для n записів"""
+        return (1 - math.exp(-self.k * self.n / self.m)) ** self.k
+
+    def info(self):
+        return {
+            "записів": self.n,
+            "біт": self.m,
+            "хешів": self.k,
+            "розмір_байт": self.size_bytes,
+            "хибні_збіги": self.false_positive_rate,
+        }
+
+    def close(self):
+        self._mm.close()
+
+    @staticmethod
+    def build(hash_path, out_path, fp_rate=0.001, algo="sha1", batch=1_000_000):
+        """
+        Створює фільтр зі списку хешів (hex, по одному на рядок; формат
+        "ХЕШ:кількість" теж підходить). Файл заповнюється через mmap,
+        тому пам'ять не залежить від розміру корпусу.
+        """
+        with open(hash_path, encoding="ascii", errors="ignore") as f:
+            n = sum(1 for line in f if line.strip())
+        n = max(n, 1)
+        m = max(8, math.ceil(-n * math.log(fp_rate) / math.log(2) ** 2))
+        k = max(1, round(m / n * math.log(2)))
+
+        with open(out_path, "w+b") as out:
+            out.truncate(BLOOM_OFFSET + (m + 7) // 8)
+            with mmap.mmap(out.fileno(), 0) as mm:
+                _BLOOM_HEADER.pack_into(mm, 0, BLOOM_MAGIC, m, n, k, algo.encode("ascii"))
+                bits = np.frombuffer(mm, dtype=np.uint8, offset=BLOOM_OFFSET)
+                try:
+                    steps = np.arange(k, dtype=np.uint64)
+                    with open(hash_path, encoding="ascii", errors="ignore") as f:
+                        while True:
+                            lines = [line.split(":", 1)[0].strip() for line in f.readlines(batch * 48)]
+                            lines = [h[:32] for h in lines if h]
+                            if not lines:
+                                break
+                            words = np.frombuffer(bytes.fromhex("".join(lines)), dtype=">u8")
+                            words = words.reshape(-1, 2).astype(np.uint64)
+                            pos = (words[:, :1] + steps * words[:, 1:]) % np.uint64(m)
+                            pos = pos.reshape(-1)
+                            np.bitwise_or.at(bits, pos >> np.uint64(3),
+                                             np.left_shift(1, pos & np.uint64(7)).astype(np.uint8))
+                finally:
+                    # mmap не закривається, поки існує масив над ним
+                    del bits
+                mm.flush()
+        return BloomFilter(out_path)
+
+
+def safety_score(pw, name, birth=None, dictionary=None, breach=None, breached=None):
     """
     Оцінка безпечності пароля (0-3 бали)
-    1 бал — пароль не містить ім’я
+    name - ім'я (тоді потрібна birth) або готовий UserProfile
+    1 бал — пароль не містить ім’я (зокрема латиницею чи задом наперед)
     1 бал — пароль не містить дату народження (день, місяць, рік)
-    1 бал — пароль не містить прості шаблони (1234, qwerty, password)
+    1 бал — пароль не містить прості шаблони (1234, qwerty, password
+            або шаблони зі словника dictionary - автомата чи кортежу автоматів)
+    0 балів — пароль знайдено у фільтрі злитих паролів breach
+    breached - готовий результат перевірки у breach (щоб не перевіряти вдруге)
     """
+    if breached is None:
+        breached = breach is not None and pw in breach
+    if breached:
+        return 0
+    if dictionary is None:
+        dictionary = DEFAULT_DICTIONARY
+    if not isinstance(dictionary, tuple):
+        dictionary = (dictionary,)
+    # Усі перевірки - один прохід по паролю (цифри дати lower() не змінює)
+    profile = _as_profile(name, birth)
+    hits = scan_all(pw.lower(), (profile.matcher, *dictionary))
+
     score = 0
-    pw_lower = pw.lower()
-    name_lower = name.lower()
-    
-    # Перевірка імені
-    if name_lower not in pw_lower:
+    if not hits & NAME:
         score += 1
-    
-    # Перевірка дати народження (день, місяць, рік)
-    day, month, year = re.findall(r'\d+', birth)
-    patterns = [day, month, year, year[-2:]]  # рік та останні 2 цифри
-    if not any(p in pw for p in patterns):
+    if not hits & DATE:
         score += 1
-    
-    # Перевірка простих шаблонів
-    common = ['1234', 'qwerty', 'password', 'abcd']
-    if not any(c in pw_lower for c in common):
+    if not hits & COMMON:
         score += 1
-    
     return score
 
 def length_score(pw):
@@ -74,13 +507,17 @@ def length_score(pw):
     else:
         return 3
 
-def analyze_password(pw, name, birth):
+def analyze_password(pw, name, birth=None, dictionary=None, breach=None):
     """
     Основна функція аналізу пароля
-    Повертає загальні бали, рівень безпеки та рекомендації
+    name - ім'я (тоді потрібна birth) або готовий UserProfile
+    Повертає загальні бали, рівень безпеки, рекомендації
+    та ознаку наявності пароля у базі витоків
     """
+    profile = _as_profile(name, birth)
+    breached = breach is not None and pw in breach
     s_score = structure_score(pw)    # структура
-    sa_score = safety_score(pw, name, birth)  # безпечність
+    sa_score = safety_score(pw, profile, None, dictionary, breached=breached)  # безпечність
     l_score = length_score(pw)       # довжина
     
     total = s_score + sa_score + l_score
@@ -95,6 +532,8 @@ def analyze_password(pw, name, birth):
     
     # Генерація рекомендацій
     tips = []
+    if breached:
+        tips.append("Пароль знайдено у базі витоків — змініть його")
     if s_score < 4:
         tips.append("Додайте великі та малі літери, цифри та спецсимволи")
     if sa_score < 3:
@@ -105,14 +544,286 @@ def analyze_password(pw, name, birth):
     return {
         "total": total,
         "level": level,
-        "tips": tips
+        "tips": tips,
+        "breached": breached
+    }
+
+# Пакетний аудит словників паролів
+BATCH_CHUNK = 10_000    # паролів у одному завданні для процесу-обробника
+
+_worker_user = None     # (профіль, словник, фільтр) у процесі-обробнику
+
+
+def _init_worker(profile, dict_paths, breach_path):
+    global _worker_user
+    dictionary = load_dictionary(dict_paths) if dict_paths else None
+    breach = BloomFilter(breach_path) if breach_path else None
+    _worker_user = (profile, dictionary, breach)
+
+
+def _score_chunk(passwords):
+    profile, dictionary, breach = _worker_user
+    results = []
+    for pw in passwords:
+        result = analyze_password(pw, profile, None, dictionary, breach)
+        results.append((result["total"], result["level"], result["breached"]))
+    return results
+
+
+def read_wordlist(path, chunk_size=BATCH_CHUNK):
+    """
+    Потокове читання словника: повертає списки по chunk_size паролів,
+    тому пам'ять не залежить від розміру файлу. Порожні рядки пропускаються.
+    """
+    chunk = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            pw = line.rstrip("\n")
+            if not pw:
+                continue
+            chunk.append(pw)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def audit_wordlist(path, name, birth, out_path, workers=None, chunk_size=BATCH_CHUNK,
+                   dict_paths=(), breach_path=None):
+    """
+    Пакетний аналіз словника паролів для одного користувача
+    name - ім'я (тоді потрібна birth) або готовий UserProfile.
+    dict_paths - словники простих шаблонів (див. load_dictionary),
+    кожен процес-обробник завантажує їх один раз.
+    breach_path - фільтр Блума злитих паролів (BloomFilter.build).
+    Результати (пароль, бали, рівень) записуються у TSV-файл out_path,
+    гістограми рівнів і балів - у out_path + ".summary.json".
+    Одночасно в обробці не більше 2 * workers блоків, тому пам'ять стала.
+    """
+    workers = workers or os.cpu_count() or 1
+    profile = _as_profile(name, birth)
+    levels = Counter()
+    totals = Counter()
+    count = 0
+    breached = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(profile, tuple(dict_paths), breach_path)) as pool, \
+            open(out_path, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out, delimiter="\t", lineterminator="\n")
+        writer.writerow(["password", "total", "level", "breached"])
+        pending = deque()
+
+        def flush_one():
+            nonlocal count, breached
+            chunk, future = pending.popleft()
+            for pw, (total, level, in_breach) in zip(chunk, future.result()):
+                writer.writerow([pw, total, level, int(in_breach)])
+                levels[level] += 1
+                totals[total] += 1
+                breached += in_breach
+            count += len(chunk)
+
+        for chunk in read_wordlist(path, chunk_size):
+            pending.append((chunk, pool.submit(_score_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                flush_one()
+        while pending:
+            flush_one()
+
+    summary = {
+        "count": count,
+        "breached": breached,
+        "levels": dict(levels),
+        "totals": {str(t): totals[t] for t in sorted(totals)},
     }
+    if breach_path:
+        bloom = BloomFilter(breach_path)
+        summary["breach_filter"] = bloom.info()
+        bloom.close()
+    with open(out_path + ".summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+# Локальний сервіс оцінки паролів (HTTP поверх asyncio)
+SERVICE_BATCH = 256         # найбільший мікропакет для процесу-обробника
+SERVICE_DELAY = 0.002       # скільки чекати (с), поки накопичиться пакет
+LATENCY_WINDOW = 10_000     # останні запити, з яких рахуються перцентилі
+
+
+def _analyze_batch(items):
+    """Оцінка мікропакета [(пароль, ім'я, дата)] у процесі-обробнику"""
+    _, dictionary, breach = _worker_user
+    results = []
+    for pw, name, birth in items:
+        try:
+            results.append(analyze_password(pw, name, birth, dictionary, breach))
+        except ValueError as e:
+            results.append({"error": f"Невірні дані: {e}"})
+        except Exception as e:
+            # помилка одного запиту не повинна зривати весь мікропакет
+            results.append({"error": f"Невірні дані: {type(e).__name__}: {e}"})
+    return results
+
+
+class PasswordService:
+    """
+    Збирає одночасні запити у мікропакети та передає їх пулу процесів
+    Пакет відправляється, щойно набереться SERVICE_BATCH запитів або мине
+    SERVICE_DELAY секунд; одночасно в роботі не більше 2 пакетів на процес.
+    """
+
+    def __init__(self, workers=None, dict_paths=(), breach_path=None,
+                 max_batch=SERVICE_BATCH, max_delay=SERVICE_DELAY):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(None, tuple(dict_paths), breach_path))
+        self.queue = None
+        self.slots = None
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def analyze(self, pw, name, birth):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((pw, name, birth, time.perf_counter(), future))
+        return await future
+
+    async def run_batches(self):
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.workers * 2)
+        while True:
+            batch = [await self.queue.get()]
+            if self.queue.qsize() < self.max_batch and self.max_delay:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            await self.slots.acquire()
+            asyncio.create_task(self._process(batch))
+
+    async def _process(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            items = [(pw, name, birth) for pw, name, birth, _, _ in batch]
+            results = await loop.run_in_executor(self.pool, _analyze_batch, items)
+        except Exception as e:
+            results = [{"error": str(e)}] * len(batch)
+        finally:
+            self.slots.release()
+        self.batches += 1
+        now = time.perf_counter()
+        for (_, _, _, started, future), result in zip(batch, results):
+            self.requests += 1
+            self.errors += "error" in result
+            self.latencies.append(now - started)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        uptime = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "avg_batch": round(self.requests / self.batches, 1) if self.batches else 0,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "uptime_s": round(uptime, 1),
+            "throughput_rps": round(self.requests / uptime, 1) if uptime else 0,
+            "latency_ms": {"p50": percentile(0.50), "p90": percentile(0.90),
+                           "p99": percentile(0.99), "max": percentile(1.0)},
+        }
+
+    async def handle(self, reader, writer):
+        """
+        Мінімальний HTTP/1.1 з keep-alive:
+        POST /analyze {"password", "name", "birth"} та GET /stats
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method == "GET" and path == "/stats":
+                    status, payload = 200, self.stats()
+                elif method == "POST" and path == "/analyze":
+                    try:
+                        data = json.loads(body)
+                        pw, name, birth = data["password"], data["name"], data["birth"]
+                        if not all(isinstance(v, str) for v in (pw, name, birth)):
+                            raise TypeError("password, name і birth мають бути рядками")
+                        status, payload = 200, await self.analyze(pw, name, birth)
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, payload = 400, {"error": f"Невірний запит: {e}"}
+                    if "error" in payload:
+                        status = 400
+                else:
+                    status, payload = 404, {"error": "Not found"}
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start_workers(self):
+        """
+        Запускає процеси пулу до прийому з'єднань: інакше процеси, створені
+        fork під час першого пакета, успадкують відкриті сокети клієнтів і
+        закриття з'єднання сервером не дійде до клієнта.
+        """
+        await asyncio.get_running_loop().run_in_executor(self.pool, _analyze_batch, [])
+
+    async def serve(self, host="127.0.0.1", port=8080, unix_socket=None):
+        await self.start_workers()
+        batcher = asyncio.create_task(self.run_batches())
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle, path=unix_socket)
+            print(f"Сервіс запущено: {unix_socket}")
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            print(f"Сервіс запущено: http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
 
 # Меню користувача
 def menu():
     print("Password Analyzer")
     name = input("Введіть ваше ім'я: ")
     birth = input("Введіть дату народження (дд.мм.рррр): ")
+    profile = get_profile(name, birth)
     
     while True:
         print("\nМеню:")
@@ -122,7 +833,7 @@ def menu():
         
         if choice == "1":
             pw = input("Введіть пароль для аналізу: ")
-            result = analyze_password(pw, name, birth)
+            result = analyze_password(pw, profile)
             
             print("\n--- Результат аналізу ---")
             print(f"Бали: {result['total']}/10")
@@ -136,4 +847,75 @@ def menu():
         else:
             print("Невірний вибір. Спробуйте ще раз.")
 
-menu()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Password Analyzer")
+    parser.add_argument("--batch", metavar="WORDLIST",
+                        help="файл зі списком паролів (по одному на рядок)")
+    parser.add_argument("--name", help="ім'я користувача")
+    parser.add_argument("--birth", help="дата народження (дд.мм.рррр)")
+    parser.add_argument("--out", default="audit.tsv", help="файл результатів")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="кількість процесів (за замовчуванням - усі ядра)")
+    parser.add_argument("--dict", action="append", default=[], metavar="FILE",
+                        help=f"словник шаблонів: текстовий файл або {DICT_SUFFIX} (можна кілька)")
+    parser.add_argument("--save-dict", metavar="FILE",
+                        help=f"скомпілювати словники --dict у файл {DICT_SUFFIX}")
+    parser.add_argument("--breach", metavar="FILE",
+                        help="фільтр Блума злитих паролів")
+    parser.add_argument("--build-breach", metavar="HASHES",
+                        help="побудувати фільтр --breach зі списку хешів SHA-1")
+    parser.add_argument("--fp-rate", type=float, default=0.001,
+                        help="допустима частка хибних збігів фільтра")
+    parser.add_argument("--serve", action="store_true",
+                        help="запустити локальний HTTP-сервіс оцінки паролів")
+    parser.add_argument("--host", default="127.0.0.1", help="адреса сервісу")
+    parser.add_argument("--port", type=int, default=8080, help="порт сервісу")
+    parser.add_argument("--socket", metavar="PATH", help="Unix-сокет замість TCP")
+    args = parser.parse_args(argv)
+    if args.build_breach and not args.breach:
+        parser.error("--build-breach потребує --breach")
+    if args.save_dict and any(p.endswith(DICT_SUFFIX) for p in args.dict):
+        parser.error(f"--save-dict компілює лише текстові словники, не {DICT_SUFFIX}")
+    if args.batch and not (args.name and args.birth):
+        parser.error("--batch потребує --name та --birth")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.build_breach:
+        bloom = BloomFilter.build(args.build_breach, args.breach, args.fp_rate)
+        info = bloom.info()
+        print(f"Фільтр збережено: {args.breach}")
+        print(f"Записів: {info['записів']}, хешів: {info['хешів']}")
+        print(f"Розмір: {info['розмір_байт'] / 2**20:.1f} МБ")
+        print(f"Хибні збіги: {info['хибні_збіги']:.4%}")
+        return
+    if args.save_dict:
+        build_dictionary(args.dict).save(args.save_dict)
+        print(f"Словник збережено: {args.save_dict}")
+        return
+    if args.serve:
+        service = PasswordService(args.workers, args.dict, args.breach)
+        try:
+            asyncio.run(service.serve(args.host, args.port, args.socket))
+        except KeyboardInterrupt:
+            print("Сервіс зупинено")
+        return
+    if not args.batch:
+        menu()
+        return
+
+    summary = audit_wordlist(args.batch, args.name, args.birth, args.out, args.workers,
+                             dict_paths=args.dict, breach_path=args.breach)
+    print(f"Перевірено паролів: {summary['count']}")
+    if args.breach:
+        print(f"Знайдено у базі витоків: {summary['breached']}")
+    for level in ("Слабкий", "Середній", "Сильний"):
+        print(f"{level}: {summary['levels'].get(level, 0)}")
+    print(f"Результати: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,259 @@
+import argparse
+import codecs
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _cipher_tables(alphabet):
+    """
+    Таблиці шифрування для всіх зсувів алфавіту
+    Повертає (літери, таблиці translate, lut, коди), де літери - словник
+    символ -> (індекс в алфавіті, чи мала літера); lut[кодова точка] - номер
+    символу в літерах або -1; коди[зсув, номер] - кодова точка результату.
+    Перебір усього Unicode точно повторює перевірку char.upper() in alphabet.
+    """
+    letters = {}
+    for code in range(0x110000):
+        ch = chr(code)
+        upper_char = ch.upper()
+        if upper_char in alphabet:
+            letters[ch] = (alphabet.index(upper_char), ch.islower())
+
+    size = len(alphabet)
+    tables = []
+    codes = np.zeros((size, len(letters)), dtype=np.uint32)
+    for shift in range(size):
+        table = {}
+        for number, (ch, (index, is_lower)) in enumerate(letters.items()):
+            new_char = alphabet[(index + shift) % size]
+            table[ord(ch)] = new_char.lower() if is_lower else new_char
+            codes[shift, number] = ord(table[ord(ch)])
+        tables.append(table)
+
+    # Останній елемент lut (-1) - для всіх кодових точок поза таблицею
+    lut = np.full(max(map(ord, letters)) + 2, -1, dtype=np.int32)
+    lut[[ord(ch) for ch in letters]] = np.arange(len(letters))
+    return letters, tables, lut, codes
+
+
+CHUNK_CHARS = 1 << 20      # символів в одній частині потокового шифрування
+CHUNK_BYTES = 1 << 22      # байтів в одній частині при читанні діапазону файлу
+
+# Приблизні частоти літер українських текстів, %
+UKRAINIAN_FREQUENCIES = {
+    'А': 8.04, 'Б': 1.81, 'В': 4.62, 'Г': 1.61, 'Ґ': 0.03, 'Д': 3.00, 'Е': 4.40,
+    'Є': 0.57, 'Ж': 0.93, 'З': 2.28, 'И': 6.16, 'І': 5.43, 'Ї': 0.68, 'Й': 1.21,
+    'К': 3.53, 'Л': 3.70, 'М': 3.23, 'Н': 6.82, 'О': 9.33, 'П': 2.73, 'Р': 4.53,
+    'С': 4.37, 'Т': 5.43, 'У': 3.62, 'Ф': 0.24, 'Х': 1.21, 'Ц': 0.90, 'Ч': 1.42,
+    'Ш': 0.80, 'Щ': 0.65, 'Ь': 1.84, 'Ю': 0.85, 'Я': 2.64,
+}
+
+
+@lru_cache(maxsize=None)
+def _index_lut(alphabet):
+    """lut[кодова точка] - індекс літери в алфавіті (без регістру) або -1"""
+    letters, _, lut, _ = _cipher_tables(alphabet)
+    indices = np.array([index for index, _ in letters.values()] + [-1], dtype=np.int8)
+    return indices[lut]
+
+
+@lru_cache(maxsize=None)
+def _expected_frequencies(alphabet):
+    freq = np.array([UKRAINIAN_FREQUENCIES.get(ch, 0.01) for ch in alphabet])
+    return freq / freq.sum()
+
+
+def chi_squared_shifts(counts, alphabet):
+    """
+    Хі-квадрат для всіх зсувів одразу
+    counts[..., i] - кількість літери i у шифротексті; результат [..., s] -
+    відхилення тексту, розшифрованого зсувом s, від частот мови.
+    Замість 33 розшифрувань гістограма зсувається (roll) індексною матрицею.
+    """
+    size = len(alphabet)
+    counts = np.asarray(counts, dtype=np.float64)
+    rolls = (np.arange(size)[:, None] + np.arange(size)[None, :]) % size
+    observed = counts[..., rolls]                         # [..., зсув, літера]
+    expected = counts.sum(axis=-1)[..., None, None] * _expected_frequencies(alphabet)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = ((observed - expected) ** 2 / expected).sum(axis=-1)
+    return np.nan_to_num(chi2, nan=0.0)
+
+
+MAX_KEY_LENGTH = 20            # найдовший ключ Віженера, який перевіряється
+PARALLEL_LETTERS = 1_000_000   # з якої довжини шифротексту довжини ключа діляться між процесами
+
+
+def _column_counts(indices, length, size):
+    """Гістограми літер кожної позиції ключа: [позиція, літера]"""
+    columns = np.arange(len(indices)) % length
+    return np.bincount(columns * size + indices, minlength=length * size).reshape(length, size)
+
+
+def _key_length_score(indices, length, alphabet):
+    """
+    Оцінка однієї довжини ключа: середній індекс збігу стовпців
+    та найкращий зсув кожного стовпця за хі-квадратом
+    """
+    size = len(alphabet)
+    counts = _column_counts(indices, length, size).astype(np.float64)
+    n = counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ioc = (counts * (counts - 1)).sum(axis=1) / (n * (n - 1))
+    shifts = np.argmin(chi_squared_shifts(counts, alphabet), axis=1)
+    return length, float(np.nanmean(ioc)), shifts.tolist()
+
+
+_worker_cipher = None   # (індекси літер, алфавіт) у процесі-обробнику
+
+
+def _init_key_worker(indices, alphabet):
+    global _worker_cipher
+    _worker_cipher = (indices, alphabet)
+
+
+def _key_length_worker(length):
+    indices, alphabet = _worker_cipher
+    return _key_length_score(indices, length, alphabet)
+
+
+def _to_codes(text):
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+def _from_codes(codes):
+    return codes.tobytes().decode("utf-32-le", "surrogatepass")
+
+
+# ========== N-ГРАМНА СТАТИСТИКА ==========
+class NgramStats:
+    """
+    Частоти літер і матриця біграм (сусідні літери без регістру)
+    Статистику можна накопичувати частинами (update) та об'єднувати
+    результати процесів (merge) - біграма на межі частин теж враховується.
+    """
+
+    def __init__(self, alphabet):
+        size = len(alphabet)
+        self.alphabet = alphabet
+        self.unigrams = np.zeros(size, dtype=np.int64)
+        self.bigrams = np.zeros((size, size), dtype=np.int64)
+        self.first = None    # індекс першого символу (-1 - не літера)
+        self.last = None     # індекс останнього символу
+
+    def update(self, text):
+        """Додає наступну частину тексту"""
+        lut = _index_lut(self.alphabet)
+        indices = lut[np.minimum(_to_codes(text), len(lut) - 1)].astype(np.int64)
+        if not len(indices):
+            return self
+        size = len(self.alphabet)
+        if self.first is None:
+            self.first = int(indices[0])
+        elif self.last >= 0 and indices[0] >= 0:
+            self.bigrams[self.last, indices[0]] += 1
+        self.last = int(indices[-1])
+
+        self.unigrams += np.bincount(indices[indices >= 0], minlength=size)
+        left, right = indices[:-1], indices[1:]
+        pairs = (left >= 0) & (right >= 0)
+        self.bigrams += np.bincount(left[pairs] * size + right[pairs],
+                                    minlength=size * size).reshape(size, size)
+        return self
+
+    def merge(self, other):
+        """Додає статистику тексту, що йде одразу після цього"""
+        if other.first is None:
+            return self
+        if self.first is None:
+            self.first = other.first
+        elif self.last >= 0 and other.first >= 0:
+            self.bigrams[self.last, other.first] += 1
+        self.last = other.last
+        self.unigrams += other.unigrams
+        self.bigrams += other.bigrams
+        return self
+
+    @property
+    def total(self):
+        return int(self.unigrams.sum())
+
+    @property
+    def frequencies(self):
+        return self.unigrams / self.total if self.total else self.unigrams.astype(np.float64)
+
+    @property
+    def entropy(self):
+        """Ентропія розподілу літер, біт на літеру"""
+        p = self.frequencies[self.unigrams > 0]
+        return float(-(p * np.log2(p)).sum())
+
+    @property
+    def index_of_coincidence(self):
+        n = self.total
+        if n < 2:
+            return 0.0
+        return float((self.unigrams * (self.unigrams - 1)).sum() / (n * (n - 1)))
+
+    def bigram_count(self, bigram):
+        first, second = (self.alphabet.index(ch) for ch in bigram.upper())
+        return int(self.bigrams[first, second])
+
+    @classmethod
+    def from_file(cls, path, alphabet, workers=None, chunk_size=CHUNK_BYTES):
+        """
+        Статистика UTF-8 файлу будь-якого розміру
+        Файл ділиться на діапазони байтів за кількістю процесів, кожен процес
+        читає свій діапазон частинами, результати об'єднуються по порядку.
+        """
+        size = os.path.getsize(path)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or size < chunk_size:
+            return _range_stats(path, 0, size, alphabet, chunk_size)
+        step = math.ceil(size / workers)
+        ranges = [(path, start, min(start + step, size), alphabet, chunk_size)
+                  for start in range(0, size, step)]
+        stats = cls(alphabet)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_range_stats, *zip(*ranges)):
+                stats.merge(part)
+        return stats
+
+
+def _align_utf8(f, pos):
+    """Зсуває позицію вперед до початку символу UTF-8"""
+    f.seek(pos)
+    while True:
+        byte = f.read(1)
+        if not byte or byte[0] & 0xC0 != 0x80:
+            return pos
+        pos += 1
+
+
+def _range_stats(path, start, end, alphabet, chunk_size):
+    stats = NgramStats(alphabet)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        start = _align_utf8(f, start) if start else 0
+        end = _align_utf8(f, end)
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            stats.update(decoder.decode(data))
+        stats.update(decoder.decode(b"", final=True))
+    return stats
+
+
 class CipherAnalysis:
     def __init__(self):
         self.ukrainian_alphabet = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
@@ -9,81 +265,205 @@ class CipherAnalysis:
         return sum(digits)
     
     def caesar_encrypt(self, text, shift):
-        """Шифрування методом Цезаря"""
-        result = []
-        for char in text:
-            upper_char = char.upper()
-            if upper_char in self.ukrainian_alphabet:
-                old_index = self.ukrainian_alphabet.index(upper_char)
-                new_index = (old_index + shift) % len(self.ukrainian_alphabet)
-                new_char = self.ukrainian_alphabet[new_index]
-                result.append(new_char.lower() if char.islower() else new_char)
-            else:
-                result.append(char)
-        return ''.join(result)
+        """Шифрування методом Цезаря (одна таблиця translate на зсув)"""
+        _, tables, _, _ = _cipher_tables(self.ukrainian_alphabet)
+        return text.translate(tables[shift % len(self.ukrainian_alphabet)])
     
     def caesar_decrypt(self, text, shift):
         """Розшифрування методом Цезаря"""
         return self.caesar_encrypt(text, -shift)
     
     # ========== ШИФР ВІЖЕНЕРА ==========
+    def _vigenere(self, text, key, sign, offset=0):
+        """
+        Віженер через таблицю кодів: кожна літера отримує позицію ключа
+        (накопичена кількість літер), а результат береться з коди[зсув, літера].
+        offset - позиція ключа для першої літери. Повертає (текст, кількість літер).
+        """
+        _, _, lut, codes = _cipher_tables(self.ukrainian_alphabet)
+        text_codes = _to_codes(text)
+        numbers = lut[np.minimum(text_codes, len(lut) - 1)]
+        is_letter = numbers >= 0
+        count = int(np.count_nonzero(is_letter))
+        if not count:
+            return text, 0
+
+        key_upper = key.upper()
+        key_len = len(key_upper)
+        start = offset % key_len
+        key_shifts = np.zeros(key_len, dtype=np.int64)
+        for j in range(min(key_len, count)):
+            position = (start + j) % key_len
+            key_shifts[position] = self.ukrainian_alphabet.index(key_upper[position])
+        shifts = key_shifts[(np.arange(count) + start) % key_len]
+        shifts = (sign * shifts) % len(self.ukrainian_alphabet)
+
+        result = text_codes.copy()
+        result[is_letter] = codes[shifts, numbers[is_letter]]
+        return _from_codes(result), count
+
     def vigenere_encrypt(self, text, key):
         """Шифрування методом Віженера"""
-        result = []
-        key_upper = key.upper()
-        key_index = 0
-        
-        for char in text:
-            upper_char = char.upper()
-            if upper_char in self.ukrainian_alphabet:
-                text_index = self.ukrainian_alphabet.index(upper_char)
-                key_char = key_upper[key_index % len(key_upper)]
-                key_shift = self.ukrainian_alphabet.index(key_char)
-                new_index = (text_index + key_shift) % len(self.ukrainian_alphabet)
-                new_char = self.ukrainian_alphabet[new_index]
-                result.append(new_char.lower() if char.islower() else new_char)
-                key_index += 1
-            else:
-                result.append(char)
-        return ''.join(result)
-    
+        return self._vigenere(text, key, 1)[0]
+
     def vigenere_decrypt(self, text, key):
         """Розшифрування методом Віженера"""
-        result = []
-        key_upper = key.upper()
-        key_index = 0
-        
-        for char in text:
-            upper_char = char.upper()
-            if upper_char in self.ukrainian_alphabet:
-                text_index = self.ukrainian_alphabet.index(upper_char)
-                key_char = key_upper[key_index % len(key_upper)]
-                key_shift = self.ukrainian_alphabet.index(key_char)
-                new_index = (text_index - key_shift) % len(self.ukrainian_alphabet)
-                new_char = self.ukrainian_alphabet[new_index]
-                result.append(new_char.lower() if char.islower() else new_char)
-                key_index += 1
-            else:
-                result.append(char)
-        return ''.join(result)
-    
+        return self._vigenere(text, key, -1)[0]
+
+    # ========== ПОТОКОВЕ ШИФРУВАННЯ ФАЙЛІВ ==========
+    def _transform_file(self, src_path, dst_path, transform, chunk_size):
+        """
+        Читає UTF-8 файл частинами по chunk_size символів (декодер TextIOWrapper
+        сам дочитує розірвані багатобайтові символи) і записує результат
+        transform(частина) -> текст. Пам'ять обмежена розміром частини.
+        """
+        with open(src_path, encoding="utf-8", newline="") as src, \
+                open(dst_path, "w", encoding="utf-8", newline="") as dst:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                dst.write(transform(chunk))
+        return dst_path
+
+    def caesar_encrypt_file(self, src_path, dst_path, shift, chunk_size=CHUNK_CHARS):
+        """Потокове шифрування файлу методом Цезаря"""
+        return self._transform_file(src_path, dst_path,
+                                    lambda chunk: self.caesar_encrypt(chunk, shift), chunk_size)
+
+    def caesar_decrypt_file(self, src_path, dst_path, shift, chunk_size=CHUNK_CHARS):
+        """Потокове розшифрування файлу методом Цезаря"""
+        return self.caesar_encrypt_file(src_path, dst_path, -shift, chunk_size)
+
+    def _vigenere_file(self, src_path, dst_path, key, sign, chunk_size):
+        offset = 0      # позиція ключа переходить між частинами
+
+        def transform(chunk):
+            nonlocal offset
+            result, count = self._vigenere(chunk, key, sign, offset)
+            offset += count
+            return result
+
+        return self._transform_file(src_path, dst_path, transform, chunk_size)
+
+    def vigenere_encrypt_file(self, src_path, dst_path, key, chunk_size=CHUNK_CHARS):
+        """Потокове шифрування файлу методом Віженера"""
+        return self._vigenere_file(src_path, dst_path, key, 1, chunk_size)
+
+    def vigenere_decrypt_file(self, src_path, dst_path, key, chunk_size=CHUNK_CHARS):
+        """Потокове розшифрування файлу методом Віженера"""
+        return self._vigenere_file(src_path, dst_path, key, -1, chunk_size)
+
+    # ========== ЗЛАМ ЦЕЗАРЯ ==========
+    def letter_indices(self, text):
+        """Масив індексів літер тексту в алфавіті (інші символи відкидаються)"""
+        lut = _index_lut(self.ukrainian_alphabet)
+        indices = lut[np.minimum(_to_codes(text), len(lut) - 1)]
+        return indices[indices >= 0]
+
+    def letter_counts(self, text, chunk_size=CHUNK_CHARS):
+        """Гістограма літер; довгий текст обробляється частинами"""
+        counts = np.zeros(len(self.ukrainian_alphabet), dtype=np.int64)
+        for start in range(0, len(text), chunk_size):
+            counts += np.bincount(self.letter_indices(text[start:start + chunk_size]),
+                                  minlength=len(counts))
+        return counts
+
+    def _rank_shifts(self, counts):
+        chi2 = chi_squared_shifts(counts, self.ukrainian_alphabet)
+        return [(int(shift), float(chi2[shift])) for shift in np.argsort(chi2, kind="stable")]
+
+    def crack_caesar(self, ciphertext):
+        """
+        Перебір усіх 33 зсувів за одну гістограму
+        Повертає список (ключ, хі-квадрат) від найімовірнішого ключа
+        """
+        return self._rank_shifts(self.letter_counts(ciphertext))
+
+    def crack_caesar_file(self, path, chunk_size=CHUNK_CHARS):
+        """Злам Цезаря для UTF-8 файлу будь-якого розміру (потокова гістограма)"""
+        counts = np.zeros(len(self.ukrainian_alphabet), dtype=np.int64)
+        with open(path, encoding="utf-8", newline="") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                counts += self.letter_counts(chunk, chunk_size)
+        return self._rank_shifts(counts)
+
+    def crack_caesar_batch(self, messages):
+        """Найімовірніший ключ для кожного з багатьох коротких повідомлень"""
+        size = len(self.ukrainian_alphabet)
+        if not messages:
+            return []
+        lut = _index_lut(self.ukrainian_alphabet)
+        lengths = [len(m) for m in messages]
+        indices = lut[np.minimum(_to_codes(''.join(messages)), len(lut) - 1)]
+        owners = np.repeat(np.arange(len(messages)), lengths)
+        is_letter = indices >= 0
+        counts = np.bincount(owners[is_letter] * size + indices[is_letter],
+                             minlength=len(messages) * size).reshape(len(messages), size)
+        chi2 = chi_squared_shifts(counts, self.ukrainian_alphabet)
+        return np.argmin(chi2, axis=1).tolist()
+
+    # ========== ЗЛАМ ВІЖЕНЕРА ==========
+    def recover_vigenere_key(self, ciphertext, max_length=MAX_KEY_LENGTH, workers=None):
+        """
+        Відновлення ключа Віженера
+        1) Для кожної довжини ключа рахується середній індекс збігу стовпців
+           (для українського тексту ~0.049, для випадкового ~1/33).
+        2) Обирається найменша довжина з індексом, близьким до найкращого.
+        3) Кожна літера ключа - найкращий зсув стовпця за хі-квадратом.
+        Для довгих шифротекстів довжини ключа діляться між процесами.
+        """
+        size = len(self.ukrainian_alphabet)
+        indices = self.letter_indices(ciphertext).astype(np.int64)
+        if len(indices) < 2:
+            raise ValueError("Шифротекст закороткий для відновлення ключа")
+        lengths = range(1, max(1, min(max_length, len(indices) // 2)) + 1)
+
+        if len(indices) >= PARALLEL_LETTERS and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_key_worker,
+                                     initargs=(indices, self.ukrainian_alphabet)) as pool:
+                scores = list(pool.map(_key_length_worker, lengths))
+        else:
+            scores = [_key_length_score(indices, length, self.ukrainian_alphabet)
+                      for length in lengths]
+
+        # Кратні правильної довжини мають такий самий індекс, тому береться
+        # найменша довжина, близька до найкращої (не далі 1/4 відстані до шуму)
+        best = max(s[1] for s in scores)
+        threshold = min(best, best - (best - 1 / size) / 4)
+        length, ioc, shifts = next(s for s in scores if s[1] >= threshold)
+
+        return {
+            'ключ': ''.join(self.ukrainian_alphabet[s] for s in shifts),
+            'довжина': length,
+            'індекс_збігу': ioc,
+            'кандидати': [(s[0], s[1]) for s in scores],
+        }
+
     # ========== АНАЛІЗ ==========
     def analyze_cipher(self, original, encrypted, key_complexity):
         """Аналіз результатів шифрування"""
-        unique_chars = len(set(c for c in encrypted if c.upper() in self.ukrainian_alphabet))
-        
+        letters, _, _, _ = _cipher_tables(self.ukrainian_alphabet)
+        unique_chars = len(set(encrypted).intersection(letters))
+        stats = NgramStats(self.ukrainian_alphabet).update(encrypted)
+
         # Оцінка читабельності(чи схожий на український текст)
         common_bigrams = ['НА', 'ПО', 'ПР', 'СТ', 'ВІ']
-        readability_score = sum(1 for bg in common_bigrams if bg in encrypted.upper())
+        readability_score = sum(1 for bg in common_bigrams if stats.bigram_count(bg))
         readability = "Низька" if readability_score < 2 else "Середня" if readability_score < 4 else "Висока"
-        
+
         return {
             'довжина': len(encrypted),
             'унікальних_символів': unique_chars,
             'читабельність': readability,
+            'ентропія': round(stats.entropy, 3),
+            'індекс_збігу': round(stats.index_of_coincidence, 4),
             'складність_ключа': key_complexity
         }
-    
+
     def print_comparison_table(self, caesar_analysis, vigenere_analysis):
         """Виведення порівняльної таблиці"""
         print("\n" + "="*70)
@@ -94,10 +474,36 @@ class CipherAnalysis:
         print(f"{'Довжина результату':<30} {caesar_analysis['довжина']:<20} {vigenere_analysis['довжина']:<20}")
         print(f"{'Унікальних символів':<30} {caesar_analysis['унікальних_символів']:<20} {vigenere_analysis['унікальних_символів']:<20}")
         print(f"{'Читабельність':<30} {caesar_analysis['читабельність']:<20} {vigenere_analysis['читабельність']:<20}")
+        print(f"{'Ентропія (біт/літеру)':<30} {caesar_analysis['ентропія']:<20} {vigenere_analysis['ентропія']:<20}")
+        print(f"{'Індекс збігу':<30} {caesar_analysis['індекс_збігу']:<20} {vigenere_analysis['індекс_збігу']:<20}")
         print(f"{'Складність ключа':<30} {caesar_analysis['складність_ключа']:<20} {vigenere_analysis['складність_ключа']:<20}")
         print("="*70)
 
 
+# ========== ВИМІРЮВАННЯ ШВИДКОДІЇ ==========
+def benchmark_vigenere_recovery(text_lengths=(10_000, 100_000, 1_000_000, 5_000_000),
+                                key_lengths=(3, 8, 15), seed=1):
+    """Час відновлення ключа Віженера залежно від довжини шифротексту та ключа"""
+    cipher = CipherAnalysis()
+    alphabet = cipher.ukrainian_alphabet
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(alphabet.lower()))
+    freq = _expected_frequencies(alphabet)
+    cipher.caesar_encrypt("", 0)     # побудова таблиць не входить у вимірювання
+
+    print(f"{'Літер':>10} {'Ключ':>5} {'Час, с':>8} {'Літер/с':>12}  Результат")
+    for text_length in text_lengths:
+        plain = ''.join(letters[rng.choice(len(alphabet), text_length, p=freq)])
+        for key_length in key_lengths:
+            key = ''.join(alphabet[i] for i in rng.integers(0, len(alphabet), key_length))
+            encrypted = cipher.vigenere_encrypt(plain, key)
+            start = time.perf_counter()
+            found = cipher.recover_vigenere_key(encrypted)['ключ']
+            elapsed = time.perf_counter() - start
+            print(f"{text_length:>10} {key_length:>5} {elapsed:>8.3f} {text_length / elapsed:>12.0f}  "
+                  f"{'OK' if found == key else 'ПОМИЛКА: ' + found}")
+
+
 # ========== ДЕМОНСТРАЦІЯ РОБОТИ ==========
 def main():
     cipher = CipherAnalysis()
@@ -131,6 +537,10 @@ def main():
     print(f"Розшифровано: {caesar_decrypted}")
     print(f"Перевірка: {'OK' if caesar_decrypted == text else 'ПОМИЛКА'}")
     
+    cracked_shift = cipher.crack_caesar(caesar_encrypted)[0][0]
+    print(f"Злам перебором 33 зсувів (хі-квадрат): найімовірніший ключ {cracked_shift} "
+          f"({'збігається' if cracked_shift == caesar_key % len(cipher.ukrainian_alphabet) else 'не збігається'} з {caesar_key})")
+    
     # ========== ВІЖЕНЕР ==========
     print(f"\nКЛЮЧ ВІЖЕНЕРА: {surname}")
     
@@ -170,4 +580,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Шифри Цезаря та Віженера")
+    parser.add_argument("--bench", action="store_true",
+                        help="виміряти швидкість відновлення ключа Віженера")
+    if parser.parse_args().bench:
+        benchmark_vigenere_recovery()
+    else:
+        main()
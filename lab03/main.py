@@ -1,16 +1,140 @@
 from PIL import Image
 import numpy as np
+import argparse
+import hashlib
+import io
+import json
+import math
 import os
+import secrets
+import shutil
+import sqlite3
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Заголовок повідомлення: магія, версія формату, довжина та CRC32 даних
+HEADER = struct.Struct(">4sBII")
+MAGIC = b"STEG"
+FORMAT_VERSION = 1
+# Частина повідомлення, розбитого між кількома зображеннями (версія 2):
+# після заголовка - ідентифікатор набору, номер частини та кількість частин
+PART_VERSION = 2
+PART_HEADER = struct.Struct(">IHH")
+LEGACY_BLOCK = 4096     # байтів, що читаються за раз при пошуку маркера END
+TILE_ROWS = 256         # рядків зображення в одній смузі (режим "tiled")
+MODES = ("full", "tiled", "mmap")
+IMAGE_EXTENSIONS = (".png", ".bmp", ".ppm", ".jpg", ".jpeg", ".tif", ".tiff")
+
+
+class TiledPixels:
+    """
+    Плаский масив байтів RGB нестисненого файлу (PPM, 24-бітний BMP, TIFF
+    без стиснення), що читається й записується смугами рядків
+    Розташування рядків у файлі береться з img.tile без декодування, тож у
+    пам'яті не більше однієї смуги. Інші формати - ValueError.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with Image.open(path) as img:
+            self.width, self.height = img.size
+            tiles = img.tile if img.mode == "RGB" else []
+        self.row_len = self.width * 3
+        self._tiles = []      # (перший рядок, останній + 1, зміщення, крок, знизу вгору, BGR)
+        for name, (x0, y0, x1, y1), offset, args in tiles:
+            args = (args,) if isinstance(args, str) else tuple(args)
+            rawmode, stride, orientation = (*args, 0, 1)[:3]
+            if name != "raw" or (x0, x1) != (0, self.width) or rawmode not in ("RGB", "BGR"):
+                self._tiles = []
+                break
+            self._tiles.append((y0, y1, offset, stride or self.row_len, orientation < 0,
+                                rawmode == "BGR"))
+        if not self._tiles:
+            raise ValueError(f"{path}: режим tiled підтримує лише нестиснені RGB-файли "
+                             f"(PPM, BMP, TIFF)")
+        self._tiles.sort()
+
+    def __len__(self):
+        return self.row_len * self.height
+
+    def _rows(self, top, bottom):
+        """(рядок, зміщення у файлі, BGR) для рядків top..bottom-1"""
+        for y0, y1, offset, stride, flipped, bgr in self._tiles:
+            for y in range(max(top, y0), min(bottom, y1)):
+                yield y, offset + ((y1 - 1 - y) if flipped else (y - y0)) * stride, bgr
+
+    def read_rows(self, top, bottom):
+        strip = np.empty((bottom - top, self.row_len), dtype=np.uint8)
+        with open(self.path, "rb") as f:
+            for y, offset, bgr in self._rows(top, bottom):
+                f.seek(offset)
+                row = strip[y - top]
+                if f.readinto(row) != self.row_len:
+                    raise ValueError(f"{self.path}: файл обрізаний")
+                if bgr:
+                    row.reshape(-1, 3)[:] = row.reshape(-1, 3)[:, ::-1].copy()
+        return strip
+
+    def write_rows(self, top, strip):
+        with open(self.path, "r+b") as f:
+            for y, offset, bgr in self._rows(top, top + len(strip)):
+                row = strip[y - top]
+                f.seek(offset)
+                f.write(row.reshape(-1, 3)[:, ::-1].tobytes() if bgr else row.tobytes())
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(len(self))
+        if start >= stop:
+            return np.zeros(0, dtype=np.uint8)
+        top = start // self.row_len
+        bottom = -(-stop // self.row_len)
+        offset = top * self.row_len
+        return self.read_rows(top, bottom).reshape(-1)[start - offset:stop - offset]
+
+
+def open_raw(path, mode="r"):
+    """
+    Пікселі нестисненого PPM (P6, 8 біт) як np.memmap без читання файлу:
+    ОС підвантажує лише сторінки, до яких звертаються.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while head[pos:pos + 1].isspace():
+            pos += 1
+        if head[pos:pos + 1] == b"#":
+            pos = head.index(b"\n", pos) + 1
+            continue
+        end = pos
+        while end < len(head) and not head[end:end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError(f"{path}: пошкоджений заголовок PPM")
+        tokens.append(head[pos:end])
+        pos = end
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if magic != b"P6" or maxval > 255:
+        raise ValueError(f"{path}: підтримується лише двійковий 8-бітовий PPM (P6)")
+    return np.memmap(path, dtype=np.uint8, mode=mode, offset=pos + 1,
+                     shape=(width * height * 3,))
 
 
 class Steganography:
-    def __init__(self, bits=2):
+    def __init__(self, bits=2, verbose=True):
         self.BITS = bits                
         self.END = "<<<END>>>"           # Маркер завершення (ASCII)
         self.DEFAULT_IMAGE = "original.jpg"
+        self.verbose = verbose           # False - без виводу кроків (пакетна обробка)
 
-        if not os.path.exists(self.DEFAULT_IMAGE):
-            self._create_default_image()
+    def _log(self, text):
+        if self.verbose:
+            print(text)
 
     # ================================================================
     #  ДОПОМОЖНІ МЕТОДИ
@@ -25,7 +149,7 @@ class Steganography:
         arr = np.clip(arr + noise, 0, 255).astype(np.uint8)
 
         Image.fromarray(arr).save(self.DEFAULT_IMAGE)
-        print(f"[INFO] Автоматично створено {self.DEFAULT_IMAGE}")
+        self._log(f"[INFO] Автоматично створено {self.DEFAULT_IMAGE}")
 
     def text_to_bits(self, text):
         """
@@ -58,35 +182,109 @@ class Steganography:
             for i in range(len(text))
         )
 
-    # ================================================================
-    #  ПРИХОВУВАННЯ
-    # ================================================================
-
-    def hide(self, message, password="", input_img=None, output_img="hidden.png"):
-        if input_img is None:
-            input_img = self.DEFAULT_IMAGE
-
-        print("\n[1] Завантаження зображення...")
-        img = Image.open(input_img).convert("RGB")
-        arr = np.array(img).reshape(-1)
-        print(f"    Файл: {input_img}")
+    def _to_values(self, data):
+        """
+        Байти -> значення по BITS бітів для молодших розрядів пікселів.
+        Біти розкладаються np.unpackbits, останню групу доповнюють нулями.
+        """
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        pad = (-len(bits)) % self.BITS
+        if pad:
+            bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
+        weights = 1 << np.arange(self.BITS - 1, -1, -1, dtype=np.uint16)
+        return (bits.reshape(-1, self.BITS) @ weights).astype(np.uint8)
+
+    def _embed(self, arr, data):
+        """Векторний запис байтів data у молодші BITS бітів масиву arr (на місці)"""
+        values = self._to_values(data)
+        mask = 0xFF & ~((1 << self.BITS) - 1)
+        arr[:len(values)] = (arr[:len(values)] & mask) | values
+        return len(values)
 
-        print("[2] Підготовка повідомлення...")
-        # Шифруємо вихідний текст (у вигляді Python-рядка/Unicode)
-        encrypted = self.xor(message, password)
-        # Додаємо ASCII-маркер завершення
-        full_text = encrypted + self.END
-        # Кодуємо як UTF-8 - байти - біти
-        bits = self.text_to_bits(full_text)
-        print(f"    Символів у вихідному повідомленні: {len(message)}")
-        print(f"    Бітів для запису (з шифруванням і END): {len(bits)}")
-
-        capacity = len(arr) * self.BITS
-        print(f"[3] Місткість зображення: {capacity} біт")
-        if len(bits) > capacity:
-            raise ValueError("Повідомлення занадто велике для цього зображення!")
+    def _read_bytes(self, arr, offset, count):
+        """
+        Векторне читання count байтів, записаних з байта offset:
+        береться лише потрібний зріз пікселів, біти збираються np.packbits.
+        """
+        start_bit = offset * 8
+        end_bit = start_bit + count * 8
+        first = start_bit // self.BITS
+        last = min(len(arr), -(-end_bit // self.BITS))
+        values = arr[first:last] & ((1 << self.BITS) - 1)
+        shifts = np.arange(self.BITS - 1, -1, -1, dtype=np.uint8)
+        bits = ((values[:, None] >> shifts) & 1).astype(np.uint8).reshape(-1)
+        skip = start_bit - first * self.BITS
+        bits = bits[skip:skip + count * 8]
+        return np.packbits(bits[:len(bits) // 8 * 8]).tobytes()
+
+    def _pack(self, payload, part=None):
+        """
+        Заголовок + дані
+        part = (набір, номер, кількість) - частина розбитого повідомлення.
+        """
+        version = FORMAT_VERSION
+        if part is not None:
+            version = PART_VERSION
+            payload = PART_HEADER.pack(*part) + payload
+        return HEADER.pack(MAGIC, version, len(payload), zlib.crc32(payload)) + payload
 
-        print("[4] Запис LSB...")
+    def _unpack(self, arr):
+        """
+        (дані, частина) нового формату або (None, None), якщо заголовка немає;
+        частина - (набір, номер, кількість) або None для цілого повідомлення.
+        ValueError - якщо заголовок є, але дані пошкоджені.
+        """
+        magic, version, length, crc = HEADER.unpack(self._read_bytes(arr, 0, HEADER.size)
+                                                    .ljust(HEADER.size, b"\0"))
+        if magic != MAGIC:
+            return None, None
+        if version not in (FORMAT_VERSION, PART_VERSION):
+            raise ValueError(f"Непідтримувана версія формату: {version}")
+        if (HEADER.size + length) * 8 > len(arr) * self.BITS:
+            raise ValueError("Довжина в заголовку більша за місткість зображення")
+        payload = self._read_bytes(arr, HEADER.size, length)
+        if zlib.crc32(payload) != crc:
+            raise ValueError("Контрольна сума не збігається")
+        if version == FORMAT_VERSION:
+            return payload, None
+        if length < PART_HEADER.size:
+            raise ValueError("Пошкоджений заголовок частини")
+        return payload[PART_HEADER.size:], PART_HEADER.unpack(payload[:PART_HEADER.size])
+
+    def _unpack_legacy(self, arr):
+        """Дані до маркера END (старий формат) або None, якщо маркера немає"""
+        end_bytes = self.END.encode("utf-8")
+        total = len(arr) * self.BITS // 8
+        data = bytearray()
+        for offset in range(0, total, LEGACY_BLOCK):
+            search_from = max(0, len(data) - len(end_bytes) + 1)
+            data += self._read_bytes(arr, offset, min(LEGACY_BLOCK, total - offset))
+            pos = data.find(end_bytes, search_from)
+            if pos >= 0:
+                return bytes(data[:pos])
+        return None
+
+    def _embed_tiled(self, pixels, data):
+        """
+        Запис смугами по TILE_ROWS рядків: смуга читається з файлу,
+        змінюється і записується на те саме місце; запис зупиняється,
+        щойно дані записані.
+        """
+        values = self._to_values(data)
+        mask = 0xFF & ~((1 << self.BITS) - 1)
+        pos = 0
+        for top in range(0, pixels.height, TILE_ROWS):
+            if pos >= len(values):
+                break
+            strip = pixels.read_rows(top, min(top + TILE_ROWS, pixels.height))
+            flat = strip.reshape(-1)
+            part = values[pos:pos + len(flat)]
+            flat[:len(part)] = (flat[:len(part)] & mask) | part
+            pixels.write_rows(top, strip)
+            pos += len(part)
+
+    def _embed_loop(self, arr, bits):
+        """Попередній запис LSB циклом по пікселях (для порівняння швидкодії)"""
         mask = 0xFF & ~((1 << self.BITS) - 1)
         bit_i = 0
 
@@ -105,65 +303,628 @@ class Steganography:
             arr[i] = (arr[i] & mask) | int(chunk, 2)
             bit_i += self.BITS
 
-        # Повертаємо форму та зберігаємо
-        arr = arr.reshape(img.size[1], img.size[0], 3).astype(np.uint8)
-        Image.fromarray(arr).save(output_img, "PNG")
-
-        print(f"[5] Готово! Створено файл: {output_img}")
-
     # ================================================================
-    #  ВИТЯГУВАННЯ
+    #  ПРИХОВУВАННЯ
     # ================================================================
 
-    def extract(self, input_img="hidden.png", password=""):
-        print("\n[1] Зчитування зображення...")
-        img = Image.open(input_img).convert("RGB")
-        arr = np.array(img).reshape(-1)
-        print(f"    Файл: {input_img}")
+    def hide(self, message, password="", input_img=None, output_img="hidden.png", legacy=False,
+             mode="full"):
+        """
+        Приховує повідомлення у зображенні
+        Формат: заголовок (магія, версія, довжина, CRC32) + дані;
+        legacy=True - старий формат з маркером END у кінці.
+        mode: "full" - усе зображення в пам'яті;
+              "tiled" - нестиснений PPM, BMP або TIFF: копія файлу змінюється
+                        смугами по TILE_ROWS рядків (у пам'яті одна смуга);
+              "mmap" - нестиснений PPM: копія файлу змінюється через np.memmap.
+        """
+        if input_img is None:
+            input_img = self.DEFAULT_IMAGE
+            if not os.path.exists(input_img):
+                self._create_default_image()
+
+        self._log("\n[1] Підготовка повідомлення...")
+        # Шифруємо вихідний текст (у вигляді Python-рядка/Unicode)
+        encrypted = self.xor(message, password)
+        if legacy:
+            # Додаємо ASCII-маркер завершення
+            data = (encrypted + self.END).encode("utf-8")
+        else:
+            # Додаємо заголовок з довжиною та контрольною сумою
+            data = self._pack(encrypted.encode("utf-8"))
+        self._log(f"    Символів у вихідному повідомленні: {len(message)}")
+        self._log(f"    Бітів для запису (з шифруванням і {'END' if legacy else 'заголовком'}): "
+                  f"{len(data) * 8}")
+
+        self.write(data, input_img, output_img, mode)
+
+    def write(self, data, input_img, output_img, mode="full"):
+        """Записує готові байти (з заголовком) у молодші біти зображення"""
+        if mode not in MODES:
+            raise ValueError(f"Невідомий режим: {mode}")
+
+        self._log("[2] Завантаження зображення...")
+        if mode == "mmap":
+            arr = open_raw(input_img)
+            size = len(arr)
+        elif mode == "tiled":
+            size = len(TiledPixels(input_img))
+        else:
+            img = Image.open(input_img).convert("RGB")
+            arr = np.array(img).reshape(-1)
+            size = len(arr)
+        self._log(f"    Файл: {input_img}")
+
+        bits_count = len(data) * 8
+        capacity = size * self.BITS
+        self._log(f"[3] Місткість зображення: {capacity} біт")
+        if bits_count > capacity:
+            raise ValueError("Повідомлення занадто велике для цього зображення!")
 
-        print("[2] Витягування бітів...")
-        mask = (1 << self.BITS) - 1
-        bitstream = ""
-        data_bytes = bytearray()
-        end_bytes = self.END.encode("utf-8")   # Маркер у вигляді байтів
+        self._log("[4] Запис LSB...")
+        if mode == "mmap":
+            del arr
+            shutil.copyfile(input_img, output_img)
+            out = open_raw(output_img, "r+")
+            self._embed(out, data)
+            out.flush()
+            del out
+        elif mode == "tiled":
+            shutil.copyfile(input_img, output_img)
+            self._embed_tiled(TiledPixels(output_img), data)
+        else:
+            self._embed(arr, data)
+
+            # Повертаємо форму та зберігаємо
+            arr = arr.reshape(img.size[1], img.size[0], 3).astype(np.uint8)
+            Image.fromarray(arr).save(output_img, "PNG")
+
+        self._log(f"[5] Готово! Створено файл: {output_img}")
 
-        for px in arr:
-            # Витягуємо BITS молодших бітів і додаємо у бітовий потік
-            bitstream += f"{px & mask:0{self.BITS}b}"
+    # ================================================================
+    #  ВИТЯГУВАННЯ
+    # ================================================================
 
-            # З бітового потоку формуємо байти (8 біт)
-            while len(bitstream) >= 8:
-                byte = bitstream[:8]
-                bitstream = bitstream[8:]
-                data_bytes.append(int(byte, 2))
+    def extract(self, input_img="hidden.png", password="", legacy=None, mode="full"):
+        """
+        Витягує повідомлення: спершу читається лише заголовок, потім рівно
+        стільки пікселів, скільки займають дані. Без заголовка (або з
+        legacy=True) шукається маркер END старого формату.
+        mode - як у hide: "full", "tiled" (смугами) або "mmap" (PPM).
+        """
+        try:
+            payload, part = self.read(input_img, legacy, mode)
+        except ValueError as e:
+            self._log(f"[!] Повідомлення пошкоджене: {e}")
+            return ""
+        if payload is None:
+            self._log("[!] Маркер END не знайдено — повідомлення пошкоджене або неправильний пароль.")
+            return ""
+        if part is not None:
+            self._log(f"[!] Зображення містить частину {part[1] + 1} з {part[2]} "
+                      f"розбитого повідомлення — використайте batch_extract.")
+            return ""
+
+        decoded = self.decode(payload, password)
+        self._log("[3] Повідомлення успішно витягнуто!")
+        return decoded
+
+    def read(self, input_img, legacy=None, mode="full"):
+        """
+        Сирі дані з зображення: (дані, частина) як у _unpack,
+        (None, None) - повідомлення не знайдено. При legacy=None пошкоджений
+        заголовок спершу перевіряється як старий формат; ValueError - якщо
+        маркера END теж немає.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Невідомий режим: {mode}")
+        self._log("\n[1] Зчитування зображення...")
+        if mode == "mmap":
+            arr = open_raw(input_img)
+        elif mode == "tiled":
+            arr = TiledPixels(input_img)
+        else:
+            img = Image.open(input_img).convert("RGB")
+            arr = np.array(img).reshape(-1)
+        self._log(f"    Файл: {input_img}")
+
+        self._log("[2] Витягування бітів...")
+        payload, part, error = None, None, None
+        if not legacy:
+            try:
+                payload, part = self._unpack(arr)
+            except ValueError as e:
+                # Старе повідомлення теж може починатися з "STEG"
+                if legacy is False:
+                    raise
+                error = e
+        if payload is None and legacy is not False:
+            payload = self._unpack_legacy(arr)
+            if payload is None and error is not None:
+                raise error
+        return payload, part
+
+    def decode(self, payload, password=""):
+        # Повертаємо зашифрований текст, який був після XOR
+        encrypted_text = payload.decode("utf-8", errors="strict")
+
+        # Розшифровуємо, якщо задано пароль
+        if password:
+            return self.xor(encrypted_text, password)
+        return encrypted_text
 
-                # Перевіряємо, чи є вже послідовність END у байтах
-                if end_bytes in data_bytes:
-                    all_data = bytes(data_bytes)
 
-                    # Усе, що ДО END — це зашифрований текст
-                    encrypted_bytes = all_data.split(end_bytes)[0]
+# ================================================================
+#  ПАКЕТНА ОБРОБКА
+# ================================================================
+def list_images(paths):
+    """Файли зображень: каталоги розгортаються (за іменем), файли беруться як є"""
+    if isinstance(paths, str):
+        paths = [paths]
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            found.append(path)
+    return found
+
+
+def image_capacity(path, bits, mode="full"):
+    """Скільки байтів даних (без заголовків) поміщається в зображення"""
+    if mode == "mmap":
+        size = len(open_raw(path))
+    else:
+        with Image.open(path) as img:
+            size = img.width * img.height * 3
+    return size * bits // 8 - HEADER.size - PART_HEADER.size
+
+
+def _output_paths(carriers, out_dir, ext):
+    """
+    Унікальні шляхи результатів: ім'я контейнера зберігає своє розширення
+    (a.png -> a.png.png, a.bmp -> a.bmp.png), однакові імена з різних
+    каталогів отримують номер (a-1.png.png); ext=None - результат у форматі
+    контейнера (a.bmp -> a.bmp.bmp).
+    """
+    used = set()
+    outputs = []
+    for path in carriers:
+        name = os.path.basename(path)
+        root, suffix = os.path.splitext(name)
+        number = 0
+        while os.path.normcase(name) in used:
+            number += 1
+            name = f"{root}-{number}{suffix}"
+        used.add(os.path.normcase(name))
+        outputs.append(os.path.join(out_dir, name + (suffix if ext is None else ext)))
+    return outputs
+
+
+def _split_payload(payload, capacities):
+    """
+    Ділить дані між зображеннями пропорційно місткості, щоб робота
+    рівномірно розподілилась між процесами.
+    """
+    total = sum(capacities)
+    if len(payload) > total:
+        raise ValueError(f"Повідомлення ({len(payload)} Б) більше за сумарну місткість ({total} Б)")
+    parts, start, cumulative = [], 0, 0
+    for capacity in capacities:
+        cumulative += capacity
+        end = len(payload) * cumulative // total
+        parts.append(payload[start:end])
+        start = end
+    return parts
+
+
+def _hide_job(job):
+    input_img, output_img, data, bits, mode = job
+    start = time.perf_counter()
+    result = {"file": input_img, "output": output_img, "bytes": len(data)}
+    try:
+        Steganography(bits, verbose=False).write(data, input_img, output_img, mode)
+        result["ok"] = True
+    except Exception as e:    # зокрема DecompressionBombError - збій лише цього файлу
+        result.update(ok=False, error=str(e))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _extract_job(job):
+    input_img, bits, mode = job
+    start = time.perf_counter()
+    result = {"file": input_img}
+    try:
+        payload, part = Steganography(bits, verbose=False).read(input_img, mode=mode)
+        if payload is None:
+            result.update(ok=False, error="повідомлення не знайдено")
+        else:
+            result.update(ok=True, payload=payload, part=part)
+    except Exception as e:
+        result.update(ok=False, error=str(e))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _run_jobs(func, jobs, workers):
+    """Виконує завдання в пулі процесів; повертає результати та пропускну здатність"""
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) < 2:
+        results = list(map(func, jobs))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    seconds = time.perf_counter() - start
+    return {
+        "results": results,
+        "images": len(jobs),
+        "seconds": seconds,
+        "images_per_second": len(jobs) / seconds if seconds else 0.0,
+    }
+
+
+def batch_hide(carriers, out_dir, message, password="", bits=2, split=False, workers=None,
+               mode="full"):
+    """
+    Приховує повідомлення в багатьох зображеннях пулом процесів
+    split=False - повне повідомлення в кожному зображенні;
+    split=True - повідомлення ділиться між зображеннями (частини з номерами).
+    Результати - словники по файлах (ok, error, bytes, seconds) замість друку.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Невідомий режим: {mode}")
+    carriers = list_images(carriers)
+    if not carriers:
+        raise ValueError("Немає зображень для обробки")
+    os.makedirs(out_dir, exist_ok=True)
+    ext = {"mmap": ".ppm", "tiled": None}.get(mode, ".png")
+    outputs = _output_paths(carriers, out_dir, ext)
+
+    steg = Steganography(bits, verbose=False)
+    payload = steg.xor(message, password).encode("utf-8")
+    if split:
+        if len(carriers) > 0xFFFF:
+            raise ValueError("Забагато зображень для одного набору")
+        capacities = [max(0, image_capacity(path, bits, mode)) for path in carriers]
+        set_id = secrets.randbits(32)
+        chunks = _split_payload(payload, capacities)
+        data = [steg._pack(chunk, (set_id, seq, len(chunks))) for seq, chunk in enumerate(chunks)]
+    else:
+        data = [steg._pack(payload)] * len(carriers)
+
+    jobs = [(src, dst, item, bits, mode) for src, dst, item in zip(carriers, outputs, data)]
+    return _run_jobs(_hide_job, jobs, workers)
+
+
+def batch_extract(paths, password="", bits=2, workers=None, mode="full"):
+    """
+    Витягує повідомлення з багатьох зображень пулом процесів
+    Частини розбитих повідомлень збираються за набором і номером;
+    "messages" - список словників (files, message) або (files, error).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Невідомий режим: {mode}")
+    report = _run_jobs(_extract_job, [(path, bits, mode) for path in list_images(paths)],
+                       workers)
+
+    steg = Steganography(bits, verbose=False)
+    messages, sets = [], {}
+    for result in report["results"]:
+        if not result["ok"]:
+            continue
+        part = result.pop("part")
+        payload = result.pop("payload")
+        result["bytes"] = len(payload)
+        if part is None:
+            messages.append({"files": [result["file"]], "payload": payload})
+        else:
+            set_id, seq, total = part
+            result["part"] = seq + 1
+            group = sets.setdefault(set_id, {"total": total, "parts": {}})
+            group["parts"][seq] = (result["file"], payload)
+
+    for set_id, group in sets.items():
+        parts = group["parts"]
+        missing = [seq + 1 for seq in range(group["total"]) if seq not in parts]
+        files = [parts[seq][0] for seq in sorted(parts)]
+        if missing:
+            messages.append({"files": files, "error": f"бракує частин {missing} з {group['total']}"})
+        else:
+            payload = b"".join(parts[seq][1] for seq in range(group["total"]))
+            messages.append({"files": files, "payload": payload})
+
+    for item in messages:
+        if "payload" in item:
+            try:
+                item["message"] = steg.decode(item.pop("payload"), password)
+            except UnicodeDecodeError as e:
+                item["error"] = f"некоректний UTF-8: {e}"
+    report["messages"] = messages
+    return report
 
-                    # Повертаємо зашифрований текст, який був після XOR
-                    encrypted_text = encrypted_bytes.decode("utf-8", errors="strict")
 
-                    # Розшифровуємо, якщо задано пароль
-                    if password:
-                        decoded = self.xor(encrypted_text, password)
-                    else:
-                        decoded = encrypted_text
+# ================================================================
+#  СТЕГОАНАЛІЗ
+# ================================================================
+CHI_SEGMENTS = 32       # частин каналу для хі-квадрат тесту
+SCAN_PLANES = 2         # скільки молодших бітових площин аналізувати
+SUSPICIOUS_RATE = 0.1   # оцінка заповнення, з якої зображення вважається підозрілим
+RS_MASK = np.array([0, 1, 1, 0], dtype=np.int16)
+
+
+def _chi2_sf(chi, dof):
+    """P(X >= chi) для розподілу хі-квадрат (наближення Вілсона-Гілферті)"""
+    dof = np.maximum(dof, 1)
+    z = ((chi / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / np.sqrt(2 / (9 * dof))
+    return np.frompyfunc(math.erfc, 1, 1)(z / math.sqrt(2)).astype(np.float64) / 2
+
+
+def chi_square_rate(values, plane=0, segments=CHI_SEGMENTS):
+    """
+    Хі-квадрат тест пар значень для бітової площини plane
+    Канал ділиться на segments частин; у кожній гістограма values >> plane
+    порівнюється з середніми пар (2k, 2k+1). Запис LSB вирівнює пари, тому
+    частка частин з p > 0.5 - оцінка частки заповнення.
+    """
+    levels = 256 >> plane
+    step = len(values) // segments
+    if not step:
+        return 0.0
+    shifted = (values[:step * segments] >> plane).reshape(segments, step).astype(np.int64)
+    shifted += (np.arange(segments) * levels)[:, None]
+    hist = np.bincount(shifted.reshape(-1), minlength=segments * levels)
+    hist = hist.reshape(segments, levels // 2, 2)
+
+    expected = hist.sum(axis=2) / 2
+    valid = expected > 0
+    chi = (np.where(valid, hist[:, :, 0] - expected, 0) ** 2 / np.where(valid, expected, 1)).sum(axis=1)
+    dof = valid.sum(axis=1) - 1
+    p = np.where(dof > 0, _chi2_sf(chi, dof), 0.0)
+    return float((p > 0.5).mean())
+
+
+def _flip(groups, mask):
+    """F1 (x ^ 1) там, де маска 1, і F-1 ((x + 1) ^ 1) - 1 там, де -1"""
+    out = groups.copy()
+    out[:, mask == 1] ^= 1
+    out[:, mask == -1] = ((out[:, mask == -1] + 1) ^ 1) - 1
+    return out
+
+
+def _rs_fractions(groups, mask):
+    """Частки регулярних і сингулярних груп для маски"""
+    base = np.abs(np.diff(groups, axis=1)).sum(axis=1)
+    changed = np.abs(np.diff(_flip(groups, mask), axis=1)).sum(axis=1)
+    return (changed > base).mean(), (changed < base).mean()
+
+
+def rs_rate(values, plane=0):
+    """
+    RS-аналіз (Фрідріх) для бітової площини plane: групи по 4 сусідні
+    значення, порівняння регулярних/сингулярних груп для масок M та -M
+    у вихідному каналі та в каналі з інвертованою площиною.
+    """
+    count = len(values) // len(RS_MASK) * len(RS_MASK)
+    if not count:
+        return 0.0
+    groups = (values[:count] >> plane).astype(np.int16).reshape(-1, len(RS_MASK))
+    r_m, s_m = _rs_fractions(groups, RS_MASK)
+    r_n, s_n = _rs_fractions(groups, -RS_MASK)
+    inverted = groups ^ 1
+    r_mi, s_mi = _rs_fractions(inverted, RS_MASK)
+    r_ni, s_ni = _rs_fractions(inverted, -RS_MASK)
+
+    d0, d1 = r_m - s_m, r_mi - s_mi
+    n0, n1 = r_n - s_n, r_ni - s_ni
+    a = 2 * (d1 + d0)
+    b = n0 - n1 - d1 - 3 * d0
+    c = d0 - n0
+    disc = b * b - 4 * a * c
+    if abs(a) < 1e-12 or disc < 0:
+        # Поблизу повного заповнення R_M і S_M зливаються, рівняння втрачає
+        # дійсні корені - оцінка за тим, наскільки зійшлися R_M і S_M
+        return float(min(max(1 - d0 / n0, 0.0), 1.0)) if n0 > 0 else 0.0
+    x = min(((-b + math.sqrt(disc)) / (2 * a), (-b - math.sqrt(disc)) / (2 * a)), key=abs)
+    if x == 0.5:
+        return 1.0
+    return float(min(max(x / (x - 0.5), 0.0), 1.0))
+
+
+def analyze_pixels(pixels, planes=SCAN_PLANES):
+    """
+    Оцінки частки заповнення для масиву (висота, ширина, 3)
+    chi_square і rs - [[R, G, B] для кожної площини]; rate - найбільше
+    середнє RS по площинах.
+    """
+    channels = np.ascontiguousarray(pixels.reshape(-1, 3).T)
+    chi = [[round(chi_square_rate(ch, plane), 4) for ch in channels] for plane in range(planes)]
+    rs = [[round(rs_rate(ch, plane), 4) for ch in channels] for plane in range(planes)]
+    return {
+        "width": pixels.shape[1],
+        "height": pixels.shape[0],
+        "chi_square": chi,
+        "rs": rs,
+        "rate": round(max(sum(row) / len(row) for row in rs), 4),
+    }
+
+
+class ScanCache:
+    """
+    Кеш результатів аналізу в SQLite
+    Результати зберігаються за SHA-256 вмісту (копії файлу не аналізуються
+    повторно); таблиця файлів (шлях, розмір, mtime) -> хеш дозволяє навіть
+    не читати незмінені файли.
+    """
+
+    def __init__(self, path, readonly=False):
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                hash TEXT, planes INTEGER, result TEXT, PRIMARY KEY (hash, planes));
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT);
+        """)
+        self.db.commit()
+
+    def get(self, digest, planes):
+        row = self.db.execute("SELECT result FROM results WHERE hash = ? AND planes = ?",
+                              (digest, planes)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def lookup(self, path, stat, planes):
+        """Результат для незміненого файлу або None"""
+        row = self.db.execute("SELECT hash FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                              (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row is None:
+            return None
+        result = self.get(row[0], planes)
+        if result is not None:
+            result["hash"] = row[0]
+        return result
+
+    def put(self, path, stat, digest, planes, result):
+        stored = {key: result[key] for key in ("width", "height", "chi_square", "rs", "rate")}
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                        (digest, planes, json.dumps(stored)))
+        self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                        (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest))
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+_scan_cache = None
+_scan_planes = SCAN_PLANES
+
+
+def _init_scan_worker(cache_path, planes):
+    global _scan_cache, _scan_planes
+    _scan_cache = ScanCache(cache_path, readonly=True) if cache_path else None
+    _scan_planes = planes
+
+
+def _scan_job(path):
+    """Читає файл, рахує хеш і, якщо його немає в кеші, аналізує зображення"""
+    start = time.perf_counter()
+    result = {"file": path}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        result["hash"] = hashlib.sha256(data).hexdigest()
+        cached = _scan_cache.get(result["hash"], _scan_planes) if _scan_cache else None
+        if cached is not None:
+            result.update(cached, cached=True)
+        else:
+            with Image.open(io.BytesIO(data)) as img:
+                pixels = np.asarray(img.convert("RGB"))
+            result.update(analyze_pixels(pixels, _scan_planes), cached=False)
+        result["ok"] = True
+    except Exception as e:    # зокрема DecompressionBombError - збій лише цього файлу
+        result.update(ok=False, error=str(e))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def scan_images(paths, cache_path=None, workers=None, planes=SCAN_PLANES,
+                threshold=SUSPICIOUS_RATE):
+    """
+    Пошук зображень з LSB-вкладеннями: файли обробляються пулом процесів
+    (не більше workers * 2 у черзі), результати кешуються за хешем вмісту,
+    тож повторне сканування архіву аналізує лише нові файли.
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    cache = ScanCache(cache_path) if cache_path else None
+    results = []
+    pending = deque()
+
+    def flush_one():
+        path, stat, item = pending.popleft()
+        result = item if isinstance(item, dict) else item.result()
+        if result["ok"]:
+            result["suspicious"] = result["rate"] >= threshold
+            if cache is not None and not isinstance(item, dict):
+                cache.put(path, stat, result["hash"], planes, result)
+        results.append(result)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker,
+                                 initargs=(cache_path, planes)) as pool:
+            for path in list_images(paths):
+                try:
+                    stat = os.stat(path)
+                except OSError as e:    # файл зник після list_images
+                    pending.append((path, None, {"file": path, "ok": False,
+                                                 "error": str(e), "seconds": 0.0}))
+                    continue
+                hit = cache.lookup(path, stat, planes) if cache is not None else None
+                if hit is not None:
+                    hit.update(file=path, ok=True, cached=True, seconds=0.0)
+                    pending.append((path, stat, hit))
+                else:
+                    pending.append((path, stat, pool.submit(_scan_job, path)))
+                while len(pending) >= workers * 2 or (pending and isinstance(pending[0][2], dict)):
+                    flush_one()
+            while pending:
+                flush_one()
+    finally:
+        if cache is not None:
+            cache.commit()
+            cache.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        "results": results,
+        "images": len(results),
+        "cached": sum(1 for r in results if r.get("cached")),
+        "suspicious": sum(1 for r in results if r.get("suspicious")),
+        "seconds": seconds,
+        "images_per_second": len(results) / seconds if seconds else 0.0,
+    }
 
-                    print("[3] Повідомлення успішно витягнуто!")
-                    return decoded
 
-        print("[!] Маркер END не знайдено — повідомлення пошкоджене або неправильний пароль.")
-        return ""
+# ================================================================
+#  ВИМІРЮВАННЯ ШВИДКОДІЇ
+# ================================================================
+def benchmark_hide(sizes=((640, 480), (1920, 1080)), bits_options=(1, 2, 3)):
+    """Порівняння векторного запису LSB з циклом по пікселях (повна місткість)"""
+    rng = np.random.default_rng(0)
+    print(f"{'Розмір':>11} {'BITS':>4} {'Цикл, с':>9} {'Вектор, с':>10} {'Прискорення':>12}")
+    for width, height in sizes:
+        pixels = rng.integers(0, 256, width * height * 3, dtype=np.uint8)
+        for bits in bits_options:
+            steg = Steganography.__new__(Steganography)
+            steg.BITS = bits
+            data = rng.integers(0, 256, len(pixels) * bits // 8, dtype=np.uint8).tobytes()
+
+            loop_arr = pixels.copy()
+            start = time.perf_counter()
+            steg._embed_loop(loop_arr, "".join(f"{b:08b}" for b in data))
+            loop_time = time.perf_counter() - start
+
+            fast_arr = pixels.copy()
+            start = time.perf_counter()
+            steg._embed(fast_arr, data)
+            fast_time = time.perf_counter() - start
+
+            assert np.array_equal(loop_arr, fast_arr), "Результати не збігаються"
+            print(f"{width:>5}x{height:<5} {bits:>4} {loop_time:>9.3f} {fast_time:>10.4f} "
+                  f"{loop_time / fast_time:>11.0f}x")
 
 
 # ================================================================
 #  ПРИКЛАД ВИКОРИСТАННЯ
 # ================================================================
-if __name__ == "__main__":
+def demo():
     steg = Steganography(bits=2)
 
     message = "Це приховане повідомлення від Пащенко Марини."
@@ -173,3 +934,73 @@ if __name__ == "__main__":
 
     print("\n>>> Витягнуте повідомлення:")
     print(extracted)
+
+
+def print_report(report):
+    for result in report["results"]:
+        status = "OK" if result["ok"] else f"ПОМИЛКА: {result['error']}"
+        part = f" частина {result['part']}" if "part" in result else ""
+        print(f"  {result['file']}{part}: {status} ({result['seconds'] * 1000:.1f} мс)")
+    for item in report.get("messages", []):
+        print(f"\n>>> {', '.join(item['files'])}:")
+        print(item.get("message", f"[!] {item.get('error')}"))
+    print(f"\nЗображень: {report['images']}, час: {report['seconds']:.2f} с, "
+          f"{report['images_per_second']:.1f} зобр./с")
+
+
+def print_scan_report(report):
+    for result in report["results"]:
+        if not result["ok"]:
+            print(f"  {result['file']}: ПОМИЛКА: {result['error']}")
+            continue
+        mark = "ПІДОЗРІЛЕ" if result["suspicious"] else "чисте"
+        source = " (кеш)" if result["cached"] else ""
+        chi = max(result["chi_square"][0])
+        print(f"  {result['file']}: {mark}, заповнення ~{result['rate']:.0%} "
+              f"(хі-квадрат {chi:.0%}){source}")
+    print(f"\nЗображень: {report['images']}, з кешу: {report['cached']}, "
+          f"підозрілих: {report['suspicious']}, {report['images_per_second']:.1f} зобр./с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSB-стеганографія")
+    parser.add_argument("--bench", action="store_true",
+                        help="порівняти швидкість векторного запису з циклом")
+    parser.add_argument("--batch-hide", nargs="+", metavar="ШЛЯХ",
+                        help="каталоги/файли зображень-контейнерів")
+    parser.add_argument("--batch-extract", nargs="+", metavar="ШЛЯХ",
+                        help="каталоги/файли зображень з повідомленнями")
+    parser.add_argument("--out-dir", default="hidden", help="каталог для результатів --batch-hide")
+    parser.add_argument("--message", help="текст повідомлення")
+    parser.add_argument("--message-file", help="файл з текстом повідомлення (UTF-8)")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--bits", type=int, default=2)
+    parser.add_argument("--split", action="store_true",
+                        help="розділити повідомлення між зображеннями")
+    parser.add_argument("--workers", type=int, help="кількість процесів")
+    parser.add_argument("--mode", choices=MODES, default="full")
+    parser.add_argument("--scan", nargs="+", metavar="ШЛЯХ",
+                        help="пошук зображень з LSB-вкладеннями (хі-квадрат та RS)")
+    parser.add_argument("--cache", help="файл SQLite для кешу результатів --scan")
+    parser.add_argument("--threshold", type=float, default=SUSPICIOUS_RATE,
+                        help="оцінка заповнення, з якої зображення підозріле")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark_hide()
+    elif args.batch_hide:
+        if args.message_file:
+            with open(args.message_file, encoding="utf-8") as f:
+                args.message = f.read()
+        if args.message is None:
+            parser.error("потрібен --message або --message-file")
+        print_report(batch_hide(args.batch_hide, args.out_dir, args.message, args.password,
+                                args.bits, args.split, args.workers, args.mode))
+    elif args.batch_extract:
+        print_report(batch_extract(args.batch_extract, args.password, args.bits,
+                                   args.workers, args.mode))
+    elif args.scan:
+        print_scan_report(scan_images(args.scan, args.cache, args.workers,
+                                      threshold=args.threshold))
+    else:
+        demo()
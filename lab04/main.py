@@ -1,4 +1,12 @@
+import argparse
 import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Персональні дані
@@ -10,12 +18,94 @@ SECRET_WORD = "secret_word"
 MOD = 1_000_007
 K = 7
 
+# Розмір буфера для потокового хешування файлів
+HASH_BUFFER = 1 << 20
+
+# Маніфест каталогу: рядок підпису, далі "хеш  відносний/шлях" для кожного файлу
+MANIFEST_NAME = "MANIFEST.sha256"
+SIGNATURE_PREFIX = "# signature: "
+
+# Підпис дерева Меркла: розмір частини файлу та розширення файлу підпису
+MERKLE_CHUNK = 1 << 20
+MERKLE_SUFFIX = ".msig"
+
 # Хешування тексту (SHA-256)
 def sha256_hex(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-# Хешування вмісту файлу
-def sha256_file_hex(path: Path) -> str:
+# Хешування вмісту файлу частинами: один буфер заповнюється через readinto,
+# тож пам'ять не залежить від розміру файлу
+def sha256_file_hex(path: Path, buffer_size: int = HASH_BUFFER, use_mmap: bool = False) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if use_mmap:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # порожній файл не відображається в пам'ять
+                return digest.hexdigest()
+            with mapped, memoryview(mapped) as view:
+                for start in range(0, len(view), buffer_size):
+                    digest.update(view[start:start + buffer_size])
+            return digest.hexdigest()
+
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+# Кеш перевірених хешів у SQLite: ключ - шлях, inode, розмір і mtime_ns,
+# тож файл хешується повторно лише тоді, коли змінились його метадані
+class HashCache:
+    def __init__(self, db_path: str):
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS hashes (
+            path TEXT PRIMARY KEY, inode INTEGER, size INTEGER, mtime_ns INTEGER, digest TEXT)""")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, st: os.stat_result):
+        row = self.db.execute(
+            "SELECT digest FROM hashes WHERE path = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+            (str(path.resolve()), st.st_ino, st.st_size, st.st_mtime_ns)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, path: Path, st: os.stat_result, digest: str):
+        self.db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                        (str(path.resolve()), st.st_ino, st.st_size, st.st_mtime_ns, digest))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+# Хеш файлу через кеш; force=True - завжди хешувати заново
+def cached_sha256(path: Path, cache: HashCache = None, force: bool = False) -> str:
+    if cache is None:
+        return sha256_file_hex(path)
+    st = path.stat()
+    digest = None if force else cache.get(path, st)
+    if digest is None:
+        if force:
+            cache.misses += 1
+        digest = sha256_file_hex(path)
+        cache.put(path, st, digest)
+    return digest
+
+# Попередній варіант: весь файл у пам'яті (для порівняння швидкодії)
+def sha256_file_hex_whole(path: Path) -> str:
     data = path.read_bytes()
     return hashlib.sha256(data).hexdigest()
 
@@ -39,8 +129,12 @@ def sign_file(file_path: str, private_int: int):
     signature_int = file_hash_int ^ private_int
     Path(file_path + ".sig").write_text(str(signature_int), encoding="utf-8")
 
-# Перевірка цифрового підпису
-def verify_file(file_path: str, public_int: int):
+# Відновлення приватного ключа з публічного
+def restore_private(public_int: int) -> int:
+    return (public_int * pow(K, -1, MOD)) % MOD
+
+# Перевірка цифрового підпису (хеш береться з кешу, якщо файл не змінювався)
+def verify_file(file_path: str, public_int: int, cache: HashCache = None, force: bool = False):
     file_path = Path(file_path)
 
     # якщо користувач ввів .sig, відновлюємо ім'я файлу
@@ -52,10 +146,10 @@ def verify_file(file_path: str, public_int: int):
 
     signature_int = int(sig_path.read_text(encoding="utf-8"))
 
-    private_restored = (public_int * pow(K, -1, MOD)) % MOD
+    private_restored = restore_private(public_int)
     recovered_hash = signature_int ^ private_restored
 
-    current_hash_hex = sha256_file_hex(file_path)
+    current_hash_hex = cached_sha256(file_path, cache, force)
     current_hash_int = int(current_hash_hex, 16)
 
     if recovered_hash == current_hash_int:
@@ -63,6 +157,247 @@ def verify_file(file_path: str, public_int: int):
     return "Підпис ПІДРОБЛЕНИЙ"
 
 
+# Усі файли дерева каталогів (крім маніфесту) у стабільному порядку
+def walk_files(root: Path, manifest: Path):
+    manifest = manifest.resolve()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            if path.resolve() != manifest:
+                yield path
+
+# Хеші файлів у пулі потоків (hashlib відпускає GIL на великих блоках);
+# з кешем хешуються лише файли, чиї метадані змінились
+def hash_files(paths, workers: int = None, cache: HashCache = None, force: bool = False) -> list:
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    paths = list(paths)
+    hashes = [None] * len(paths)
+    stats = [None] * len(paths)
+    if cache is not None:
+        for i, path in enumerate(paths):
+            stats[i] = path.stat()
+            if force:
+                cache.misses += 1
+            else:
+                hashes[i] = cache.get(path, stats[i])
+    todo = [i for i, digest in enumerate(hashes) if digest is None]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i, digest in zip(todo, pool.map(sha256_file_hex, [paths[i] for i in todo])):
+            hashes[i] = digest
+            if cache is not None:
+                cache.put(paths[i], stats[i], digest)
+    return hashes
+
+# Підпис тексту маніфесту тією ж схемою, що й для файлів
+def _manifest_signature(body: str, private_int: int) -> int:
+    return int(sha256_hex(body), 16) ^ private_int
+
+# Читання маніфесту: (підпис, тіло, {шлях: хеш})
+def read_manifest(manifest: Path):
+    text = manifest.read_text(encoding="utf-8")
+    first, _, body = text.partition("\n")
+    if not first.startswith(SIGNATURE_PREFIX):
+        raise ValueError(f"{manifest}: немає рядка підпису")
+    entries = {}
+    for line in body.splitlines():
+        entries[line[66:]] = line[:64]
+    return int(first[len(SIGNATURE_PREFIX):]), body, entries
+
+# Підпис усього дерева каталогів одним маніфестом
+def sign_tree(root: str, private_int: int, manifest_path: str = None, workers: int = None) -> Path:
+    root = Path(root)
+    manifest = Path(manifest_path) if manifest_path else root / MANIFEST_NAME
+    paths = list(walk_files(root, manifest))
+    hashes = hash_files(paths, workers)
+    body = "".join(f"{digest}  {path.relative_to(root).as_posix()}\n"
+                   for path, digest in zip(paths, hashes))
+    signature = _manifest_signature(body, private_int)
+    manifest.write_text(f"{SIGNATURE_PREFIX}{signature}\n{body}", encoding="utf-8", newline="\n")
+    return manifest
+
+# Перевірка дерева за маніфестом: підпис маніфесту та хеші всіх файлів паралельно
+def verify_tree(root: str, public_int: int, manifest_path: str = None, workers: int = None,
+                cache: HashCache = None, force: bool = False) -> dict:
+    root = Path(root)
+    manifest = Path(manifest_path) if manifest_path else root / MANIFEST_NAME
+    signature, body, entries = read_manifest(manifest)
+    signature_ok = _manifest_signature(body, restore_private(public_int)) == signature
+
+    present = {path.relative_to(root).as_posix(): path for path in walk_files(root, manifest)}
+    names = [name for name in entries if name in present]
+    hashes = hash_files([present[name] for name in names], workers, cache, force)
+    mismatched = [name for name, digest in zip(names, hashes) if digest != entries[name]]
+    return {
+        "signature_ok": signature_ok,
+        "checked": len(names),
+        "mismatched": mismatched,
+        "missing": [name for name in entries if name not in present],
+        "extra": [name for name in present if name not in entries],
+        "valid": signature_ok and not mismatched and len(names) == len(entries),
+    }
+
+# Хеші частин файлу з заданими номерами: кожен потік читає свою групу
+# частин у власний буфер (читання та hashlib відпускають GIL)
+def chunk_hashes(path: Path, chunk_size: int = MERKLE_CHUNK, indices=None, workers: int = None) -> list:
+    if indices is None:
+        indices = range(_leaf_count(path.stat().st_size, chunk_size))
+    indices = list(indices)
+    workers = workers or os.cpu_count() or 1
+    step = max(1, -(-len(indices) // workers))
+    groups = [indices[i:i + step] for i in range(0, len(indices), step)]
+
+    def hash_group(group):
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        result = []
+        with open(path, "rb") as f:
+            for index in group:
+                f.seek(index * chunk_size)
+                count = f.readinto(buffer)
+                result.append(hashlib.sha256(b"\x00" + view[:count]).hexdigest())
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [digest for group in pool.map(hash_group, groups) for digest in group]
+
+# Вузол дерева: хеш пари дочірніх хешів (префікси 0/1 розділяють листки та вузли)
+def _merkle_node(left: str, right: str) -> str:
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+# Рівні дерева від листків до кореня; непарний останній вузол переноситься вгору
+def merkle_levels(leaves: list) -> list:
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parent = [_merkle_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parent.append(level[-1])
+        levels.append(parent)
+    return levels
+
+# Шлях доведення для частини index: хеші сусідів від листка до кореня
+def merkle_proof(levels: list, index: int) -> list:
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+# Перевірка хешу частини за шляхом доведення та коренем
+def verify_proof(leaf: str, index: int, leaf_count: int, proof: list, root: str) -> bool:
+    digest = leaf
+    proof = iter(proof)
+    while leaf_count > 1:
+        if index ^ 1 < leaf_count:
+            sibling = next(proof, None)
+            if sibling is None:
+                return False
+            digest = _merkle_node(sibling, digest) if index % 2 else _merkle_node(digest, sibling)
+        index //= 2
+        leaf_count = (leaf_count + 1) // 2
+    return digest == root and next(proof, None) is None
+
+# Дайджест, що підписується: корінь разом із розміром файлу та розміром частини,
+# щоб їх не можна було змінити в .msig без втрати дійсності підпису
+def _merkle_digest(root: str, size: int, chunk_size: int) -> int:
+    data = bytes.fromhex(root) + size.to_bytes(8, "big") + chunk_size.to_bytes(8, "big")
+    return int(hashlib.sha256(data).hexdigest(), 16)
+
+# Кількість частин (листків) для файлу заданого розміру
+def _leaf_count(size: int, chunk_size: int) -> int:
+    return max(1, -(-size // chunk_size))
+
+# Підпис файлу деревом Меркла: підписується дайджест кореня, розміру та розміру
+# частини за схемою make_keys; хеші частин зберігаються, щоб видавати шляхи
+# доведення для будь-якого діапазону
+def sign_file_merkle(file_path: str, private_int: int, chunk_size: int = MERKLE_CHUNK,
+                     workers: int = None) -> Path:
+    path = Path(file_path)
+    leaves = chunk_hashes(path, chunk_size, workers=workers)
+    root = merkle_levels(leaves)[-1][0]
+    size = path.stat().st_size
+    sig_path = Path(file_path + MERKLE_SUFFIX)
+    sig_path.write_text(json.dumps({
+        "size": size,
+        "chunk_size": chunk_size,
+        "root": root,
+        "signature": str(_merkle_digest(root, size, chunk_size) ^ private_int),
+        "leaves": leaves,
+    }), encoding="utf-8")
+    return sig_path
+
+# Доведення для діапазону байтів [start, end): номери частин і їх шляхи до кореня
+def range_proof(sig_path: str, start: int, end: int) -> dict:
+    sig = json.loads(Path(sig_path).read_text(encoding="utf-8"))
+    levels = merkle_levels(sig["leaves"])
+    first = start // sig["chunk_size"]
+    last = max(first + 1, -(-min(end, sig["size"]) // sig["chunk_size"]))
+    return {
+        "root": sig["root"],
+        "signature": sig["signature"],
+        "size": sig["size"],
+        "chunk_size": sig["chunk_size"],
+        "leaf_count": len(sig["leaves"]),
+        "proofs": {index: merkle_proof(levels, index) for index in range(first, last)},
+    }
+
+# Перевірка діапазону байтів: хешуються лише його частини (паралельно),
+# кожна звіряється з коренем через шлях доведення. Повна перевірка (end=None)
+# додатково звіряє реальний розмір файлу з підписаним; перервану перевірку
+# можна продовжити з verified_until.
+def verify_range(file_path: str, public_int: int, start: int = 0, end: int = None,
+                 sig_path: str = None, workers: int = None) -> dict:
+    sig_path = sig_path or file_path + MERKLE_SUFFIX
+    sig = json.loads(Path(sig_path).read_text(encoding="utf-8"))
+    proof = range_proof(sig_path, start, sig["size"] if end is None else end)
+    signature_ok = (_merkle_digest(proof["root"], proof["size"], proof["chunk_size"])
+                    ^ restore_private(public_int)) == int(proof["signature"])
+    structure_ok = proof["leaf_count"] == _leaf_count(proof["size"], proof["chunk_size"])
+    size_ok = end is not None or os.path.getsize(file_path) == proof["size"]
+
+    indices = sorted(proof["proofs"])
+    leaves = chunk_hashes(Path(file_path), proof["chunk_size"], indices, workers)
+    bad = [index for index, leaf in zip(indices, leaves)
+           if not verify_proof(leaf, index, proof["leaf_count"], proof["proofs"][index], proof["root"])]
+    first_bad = bad[0] if bad else indices[-1] + 1
+    return {
+        "signature_ok": signature_ok and structure_ok,
+        "size_ok": size_ok,
+        "chunks": len(indices),
+        "bad_chunks": bad,
+        "verified_until": min(first_bad * proof["chunk_size"], proof["size"]),
+        "valid": signature_ok and structure_ok and size_ok and not bad,
+    }
+
+# Порівняння швидкості хешування (ГБ/с) для різних буферів і mmap
+def benchmark_hashing(size_mb: int = 512, buffer_sizes=(1 << 16, 1 << 18, 1 << 20, 1 << 22, 1 << 24)):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.bin"
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+        size_gb = size_mb / 1024
+
+        variants = [("read_bytes (увесь файл)", lambda: sha256_file_hex_whole(path))]
+        for size in buffer_sizes:
+            variants.append((f"readinto {size >> 10} КБ", lambda size=size: sha256_file_hex(path, size)))
+            variants.append((f"mmap {size >> 10} КБ",
+                             lambda size=size: sha256_file_hex(path, size, use_mmap=True)))
+
+        expected = sha256_file_hex_whole(path)  # прогрів кешу ОС
+        print(f"Файл: {size_mb} МБ")
+        print(f"{'Варіант':<26} {'Час, с':>8} {'ГБ/с':>7}")
+        for label, func in variants:
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            assert result == expected, f"{label}: хеш не збігається"
+            print(f"{label:<26} {elapsed:>8.3f} {size_gb / elapsed:>7.2f}")
+
+
 def main():
     # Генерація та збереження ключів
     private_key, public_key = make_keys()
@@ -88,4 +423,69 @@ def main():
             print("Невірна команда")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Цифровий підпис файлів")
+    parser.add_argument("--bench", action="store_true",
+                        help="порівняти швидкість потокового хешування з читанням усього файлу")
+    parser.add_argument("--size-mb", type=int, default=512, help="розмір тестового файлу для --bench")
+    parser.add_argument("--sign-tree", metavar="КАТАЛОГ", help="підписати всі файли каталогу маніфестом")
+    parser.add_argument("--verify-tree", metavar="КАТАЛОГ", help="перевірити каталог за маніфестом")
+    parser.add_argument("--manifest", help=f"шлях до маніфесту (типово КАТАЛОГ/{MANIFEST_NAME})")
+    parser.add_argument("--workers", type=int, help="кількість потоків хешування")
+    parser.add_argument("--verify", nargs="+", metavar="ФАЙЛ", help="перевірити підписи файлів (.sig)")
+    parser.add_argument("--cache", help="файл SQLite з кешем перевірених хешів")
+    parser.add_argument("--force", action="store_true", help="хешувати всі файли заново, ігноруючи кеш")
+    parser.add_argument("--sign-merkle", metavar="ФАЙЛ", help=f"підписати файл деревом Меркла ({MERKLE_SUFFIX})")
+    parser.add_argument("--verify-merkle", metavar="ФАЙЛ", help="перевірити файл або діапазон за деревом Меркла")
+    parser.add_argument("--range", nargs=2, type=int, metavar=("ПОЧАТОК", "КІНЕЦЬ"),
+                        help="діапазон байтів для --verify-merkle")
+    parser.add_argument("--chunk-size", type=int, default=MERKLE_CHUNK, help="розмір частини для --sign-merkle")
+    args = parser.parse_args()
+    cache = HashCache(args.cache) if args.cache else None
+    if args.bench:
+        benchmark_hashing(args.size_mb)
+    elif args.sign_merkle:
+        private_key, _ = make_keys()
+        start = time.perf_counter()
+        sig_path = sign_file_merkle(args.sign_merkle, private_key, args.chunk_size, args.workers)
+        print(f"Підпис створено: {sig_path} ({time.perf_counter() - start:.2f} с)")
+    elif args.verify_merkle:
+        _, public_key = make_keys()
+        start, end = args.range or (0, None)
+        report = verify_range(args.verify_merkle, public_key, start, end, workers=args.workers)
+        print("Підпис кореня " + ("ДІЙСНИЙ" if report["signature_ok"] else "ПІДРОБЛЕНИЙ"))
+        print(f"Перевірено частин: {report['chunks']}")
+        if not report["size_ok"]:
+            print("Розмір файлу не збігається з підписаним")
+        if report["bad_chunks"]:
+            print(f"Пошкоджені частини: {report['bad_chunks']}")
+            print(f"Цілісні дані до байта {report['verified_until']}")
+        print("Підпис ДІЙСНИЙ" if report["valid"] else "Підпис ПІДРОБЛЕНИЙ")
+    elif args.verify:
+        _, public_key = make_keys()
+        for path in args.verify:
+            print(f"{path}: {verify_file(path, public_key, cache, args.force)}")
+    elif args.sign_tree or args.verify_tree:
+        private_key, public_key = make_keys()
+        if args.sign_tree:
+            start = time.perf_counter()
+            manifest = sign_tree(args.sign_tree, private_key, args.manifest, args.workers)
+            print(f"Маніфест створено: {manifest} ({time.perf_counter() - start:.2f} с)")
+        else:
+            start = time.perf_counter()
+            report = verify_tree(args.verify_tree, public_key, args.manifest, args.workers,
+                                 cache, args.force)
+            print("Підпис маніфесту " + ("ДІЙСНИЙ" if report["signature_ok"] else "ПІДРОБЛЕНИЙ"))
+            print(f"Перевірено файлів: {report['checked']}")
+            for label, key in (("Змінені", "mismatched"), ("Відсутні", "missing"), ("Нові (не в маніфесті)", "extra")):
+                if report[key]:
+                    print(f"{label}: {len(report[key])}")
+                    for name in report[key]:
+                        print(f"  {name}")
+            print("Каталог ЦІЛІСНИЙ" if report["valid"] else "Каталог ЗМІНЕНО")
+            print(f"Час: {time.perf_counter() - start:.2f} с")
+    else:
+        main()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Кеш: влучань {stats['hits']}, промахів {stats['misses']} ({stats['hit_rate']:.0%})")
+        cache.close()
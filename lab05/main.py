@@ -1,14 +1,63 @@
+import argparse
 import hashlib
 import base64
+import codecs
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+import numpy as np
+
+# Розмір блоку, яким XOR проходить дані (обмежує розмір розгорнутого ключа)
+XOR_BLOCK = 1 << 22
+# Розмір частини при потоковому шифруванні файлів
+FILE_CHUNK = 1 << 22
+# Блок потокового токена: байтів (кратно 3) і символів base64 (кратно 4)
+TOKEN_BLOCK = 3 << 16
+TOKEN_CHARS = TOKEN_BLOCK // 3 * 4
+# Скільки коротких повідомлень шифруються одним векторним проходом
+MESSAGE_BATCH = 1024
+
 # Генерація симетричного ключа з персональних даних
 def derive_key(personal: str, length: int = 32) -> bytes:
     digest = hashlib.sha256(personal.encode("utf-8")).digest()
     return digest[:length]
 
+# Векторний XOR src з ключем у dst блоками по XOR_BLOCK байтів;
+# offset - позиція першого байта в потоці (для обробки файлу частинами)
+def _xor_blocks(src: np.ndarray, dst: np.ndarray, key: bytes, offset: int = 0):
+    if not len(src):
+        return
+    if not key:
+        raise ValueError("Порожній ключ")
+    block = min(len(src), XOR_BLOCK)
+    # ключ, розгорнутий на блок + один період для зсуву
+    tile = np.frombuffer(key * (-(-(block + len(key)) // len(key))), dtype=np.uint8)
+    for start in range(0, len(src), block):
+        end = min(start + block, len(src))
+        shift = (offset + start) % len(key)
+        np.bitwise_xor(src[start:end], tile[shift:shift + end - start], out=dst[start:end])
+
+# XOR на місці для bytearray/memoryview (без копіювання даних)
+def xor_into(buffer, key: bytes, offset: int = 0):
+    arr = np.frombuffer(buffer, dtype=np.uint8)
+    if not arr.flags.writeable:
+        raise TypeError("Буфер лише для читання: потрібен bytearray або змінний memoryview")
+    _xor_blocks(arr, arr, key, offset)
+    return buffer
+
 # XOR-шифрування/дешифрування байтів
 def xor_bytes(data: bytes, key: bytes) -> bytes:
+    src = np.frombuffer(data, dtype=np.uint8)
+    result = np.empty_like(src)
+    _xor_blocks(src, result, key)
+    return result.tobytes()
+
+# Попередній варіант: побайтовий цикл (для порівняння швидкодії)
+def xor_bytes_loop(data: bytes, key: bytes) -> bytes:
     result = bytearray(len(data))
     for i, b in enumerate(data):
         result[i] = b ^ key[i % len(key)]
@@ -26,24 +75,219 @@ def decrypt_text(token: str, key: bytes) -> str:
     decrypted = xor_bytes(encrypted, key)
     return decrypted.decode("utf-8", errors="replace")
 
+# Потоковий XOR файлу: один буфер заповнюється через readinto, шифрується
+# на місці та записується; зсув у ключі переходить між частинами
+def xor_file(src: Path, dst: Path, key: bytes, chunk_size: int = FILE_CHUNK):
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    offset = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while True:
+            count = fin.readinto(buffer)
+            if not count:
+                break
+            xor_into(view[:count], key, offset)
+            fout.write(view[:count])
+            offset += count
+
+# Один діапазон файлу [start, end): позиційне читання в буфер потоку,
+# XOR з зсувом ключа start і позиційний запис у той самий діапазон виходу
+def _xor_range(fd_in: int, fd_out: int, key: bytes, start: int, end: int, chunk_size: int):
+    buffer = bytearray(min(chunk_size, end - start))
+    view = memoryview(buffer)
+    pos = start
+    while pos < end:
+        count = os.preadv(fd_in, [view[:min(len(buffer), end - pos)]], pos)
+        if not count:
+            raise OSError(f"Файл скоротився під час читання (позиція {pos})")
+        xor_into(view[:count], key, pos)
+        written = 0
+        while written < count:
+            written += os.pwrite(fd_out, view[written:count], pos + written)
+        pos += count
+
+# Паралельний XOR файлу: вихід заздалегідь виділяється на повний розмір,
+# файл ділиться на діапазони, кожен потік обробляє свій через pread/pwrite
+# (читання, запис і NumPy відпускають GIL). Без pread/pwrite - послідовно.
+def xor_file_parallel(src: Path, dst: Path, key: bytes, workers: int = None,
+                      chunk_size: int = FILE_CHUNK):
+    if not hasattr(os, "preadv") or not hasattr(os, "pwrite"):
+        return xor_file(src, dst, key, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(src)
+    step = max(chunk_size, -(-size // workers))
+    fd_in = os.open(src, os.O_RDONLY)
+    try:
+        fd_out = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd_out, size)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_xor_range, fd_in, fd_out, key, start, min(start + step, size), chunk_size)
+                           for start in range(0, size, step)]
+                for future in futures:
+                    future.result()
+        finally:
+            os.close(fd_out)
+    finally:
+        os.close(fd_in)
+
+# Послідовний або паралельний (workers > 1) XOR файлу
+def _xor_path(src: Path, dst: Path, key: bytes, chunk_size: int, workers: int):
+    if workers and workers > 1:
+        xor_file_parallel(src, dst, key, workers, chunk_size)
+    else:
+        xor_file(src, dst, key, chunk_size)
+
+# Потокове шифрування тексту: частини рядка -> частини токена.
+# Байти накопичуються до блоку, кратного 3, тож base64 частин склеюється
+# без доповнення і дає той самий токен, що й encrypt_text для всього тексту.
+def encrypt_stream(chunks, key: bytes, block: int = TOKEN_BLOCK):
+    block -= block % 3
+    pending = bytearray()
+    offset = 0
+    for chunk in chunks:
+        pending += chunk.encode("utf-8")
+        if len(pending) < block:
+            continue
+        ready = len(pending) - len(pending) % block
+        for start in range(0, ready, block):
+            part = pending[start:start + block]
+            yield base64.urlsafe_b64encode(xor_into(part, key, offset)).decode("ascii")
+            offset += block
+        del pending[:ready]
+    if pending:
+        yield base64.urlsafe_b64encode(xor_into(pending, key, offset)).decode("ascii")
+
+# Потокове розшифрування: частини токена -> частини тексту.
+# Пробіли та переноси рядків відкидаються, символи накопичуються до блоку,
+# кратного 4; UTF-8 символ, розрізаний між блоками, збирає інкрементальний декодер.
+def decrypt_stream(token_chunks, key: bytes, block: int = TOKEN_CHARS):
+    block -= block % 4
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    offset = 0
+    for chunk in token_chunks:
+        pending += "".join(chunk.split())
+        if len(pending) < block:
+            continue
+        ready = len(pending) - len(pending) % block
+        data = bytearray(base64.urlsafe_b64decode(pending[:ready].encode("ascii")))
+        pending = pending[ready:]
+        xor_into(data, key, offset)
+        offset += len(data)
+        text = decoder.decode(data)
+        if text:
+            yield text
+    data = bytearray(base64.urlsafe_b64decode(pending.encode("ascii")))
+    xor_into(data, key, offset)
+    text = decoder.decode(data, final=True)
+    if text:
+        yield text
+
+# XOR багатьох коротких повідомлень одним проходом: кожне починається
+# з нульової позиції ключа, як в окремому виклику xor_bytes
+def _xor_messages(parts: list, key: bytes) -> list:
+    lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))
+    data = np.frombuffer(b"".join(parts), dtype=np.uint8)
+    if not len(data):
+        return list(parts)
+    if not key:
+        raise ValueError("Порожній ключ")
+    starts = np.cumsum(lengths) - lengths
+    positions = (np.arange(len(data)) - np.repeat(starts, lengths)) % len(key)
+    result = (data ^ np.frombuffer(key, dtype=np.uint8)[positions]).tobytes()
+    return [result[start:start + length] for start, length in zip(starts.tolist(), lengths.tolist())]
+
+# Групи по size елементів з будь-якого ітератора
+def _batched(items, size: int):
+    items = iter(items)
+    while True:
+        group = list(islice(items, size))
+        if not group:
+            return
+        yield group
+
+# Пакетне шифрування повідомлень одним ключем (генератор токенів,
+# пам'ять обмежена розміром пакета)
+def encrypt_batch(messages, key: bytes, batch_size: int = MESSAGE_BATCH):
+    for group in _batched(messages, batch_size):
+        for encrypted in _xor_messages([message.encode("utf-8") for message in group], key):
+            yield base64.urlsafe_b64encode(encrypted).decode("ascii")
+
+# Пакетне розшифрування токенів одним ключем
+def decrypt_batch(tokens, key: bytes, batch_size: int = MESSAGE_BATCH):
+    for group in _batched(tokens, batch_size):
+        raw = [base64.urlsafe_b64decode(token.encode("ascii")) for token in group]
+        for decrypted in _xor_messages(raw, key):
+            yield decrypted.decode("utf-8", errors="replace")
+
 # Шифрування файлу (вкладення)
-def encrypt_file(path: str, key: bytes) -> str:
+def encrypt_file(path: str, key: bytes, chunk_size: int = FILE_CHUNK, workers: int = 1) -> str:
     p = Path(path)
-    data = p.read_bytes()
-    encrypted = xor_bytes(data, key)
     out = p.with_suffix(p.suffix + ".enc")
-    out.write_bytes(encrypted)
+    _xor_path(p, out, key, chunk_size, workers)
     return str(out)
 
 # Розшифрування файлу (вкладення)
-def decrypt_file(path: str, key: bytes) -> str:
+def decrypt_file(path: str, key: bytes, chunk_size: int = FILE_CHUNK, workers: int = 1) -> str:
     p = Path(path)
-    encrypted = p.read_bytes()
-    decrypted = xor_bytes(encrypted, key)
     out = p.with_suffix("") if p.suffix == ".enc" else p.with_name(p.name + ".dec")
-    out.write_bytes(decrypted)
+    _xor_path(p, out, key, chunk_size, workers)
     return str(out)
 
+# Порівняння швидкості (ГБ/с) векторного XOR з побайтовим циклом
+def benchmark_xor(size_mb: int = 256, loop_mb: int = 4, key_lengths=(16, 32, 61)):
+    print(f"{'Ключ':>5} {'Варіант':<22} {'МБ':>5} {'Час, с':>8} {'ГБ/с':>7}")
+    for key_length in key_lengths:
+        key = os.urandom(key_length)
+        small = os.urandom(loop_mb << 20)
+        large = os.urandom(size_mb << 20)
+        buffer = bytearray(large)
+
+        start = time.perf_counter()
+        expected = xor_bytes_loop(small, key)
+        rows = [("цикл (xor_bytes_loop)", loop_mb, time.perf_counter() - start)]
+        assert xor_bytes(small, key) == expected, "Результати не збігаються"
+
+        start = time.perf_counter()
+        xor_bytes(large, key)
+        rows.append(("xor_bytes", size_mb, time.perf_counter() - start))
+
+        start = time.perf_counter()
+        xor_into(buffer, key)
+        rows.append(("xor_into (на місці)", size_mb, time.perf_counter() - start))
+
+        for label, mb, elapsed in rows:
+            print(f"{key_length:>5} {label:<22} {mb:>5} {elapsed:>8.3f} {mb / 1024 / elapsed:>7.3f}")
+
+
+# Масштабування шифрування файлу від 1 до N потоків (ГБ/с і прискорення)
+def benchmark_parallel(size_mb: int = 512, max_workers: int = None):
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, max_workers} | {2 ** i for i in range(max_workers.bit_length()) if 2 ** i <= max_workers})
+    key = os.urandom(32)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "bench.bin"
+        with open(src, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+        xor_file(src, Path(tmp) / "expected.enc", key)
+        expected = (Path(tmp) / "expected.enc").read_bytes()
+
+        print(f"Файл: {size_mb} МБ, потоків у системі: {os.cpu_count()}")
+        print(f"{'Потоків':>7} {'Час, с':>8} {'ГБ/с':>7} {'Прискорення':>12}")
+        base = None
+        for workers in counts:
+            dst = Path(tmp) / f"out{workers}.enc"
+            start = time.perf_counter()
+            xor_file_parallel(src, dst, key, workers)
+            elapsed = time.perf_counter() - start
+            assert dst.read_bytes() == expected, "Результати не збігаються"
+            dst.unlink()
+            base = base or elapsed
+            print(f"{workers:>7} {elapsed:>8.3f} {size_mb / 1024 / elapsed:>7.2f} {base / elapsed:>11.2f}x")
+
+
 def main():
     # Ввід даних, з яких формується ключ
     email = input("Електронна адреса: ").strip()
@@ -90,4 +334,16 @@ def main():
             print("Невірна команда")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Симетричне XOR-шифрування")
+    parser.add_argument("--bench", action="store_true", help="порівняти швидкість векторного XOR з циклом")
+    parser.add_argument("--bench-parallel", action="store_true",
+                        help="масштабування паралельного шифрування файлу від 1 до N потоків")
+    parser.add_argument("--workers", type=int, help="найбільша кількість потоків для --bench-parallel")
+    parser.add_argument("--size-mb", type=int, default=256, help="обсяг даних для --bench")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark_xor(args.size_mb)
+    elif args.bench_parallel:
+        benchmark_parallel(args.size_mb, args.workers)
+    else:
+        main()
@@ -1,12 +1,35 @@
 # База даних SQLite створюється автоматично в файлі demo.db
 
+import argparse
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
 DB_NAME = "demo.db"
 LOG_NAME = "attacks.log"
 
+# Параметри пулу з'єднань
+POOL_SIZE = 8
+STATEMENT_CACHE = 256   # підготовлених запитів, що зберігаються в кожному з'єднанні
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Параметризовані запити: той самий рядок SQL щоразу, тож sqlite3 бере
+# підготовлений запит з кешу з'єднання замість повторного розбору
+SEARCH_SQL = "SELECT id, full_name, group_name, phone FROM students WHERE full_name LIKE ?"
+LOGIN_SQL = "SELECT username, role FROM users WHERE username=? AND password=?"
+
 def log_event(text: str) -> None:
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     Path(LOG_NAME).write_text("", encoding="utf-8") if not Path(LOG_NAME).exists() else None
@@ -16,6 +39,74 @@ def log_event(text: str) -> None:
 def connect():
     return sqlite3.connect(DB_NAME)
 
+# Потокобезпечний пул відкритих з'єднань з WAL і налаштованими PRAGMA
+class ConnectionPool:
+    def __init__(self, path: str = DB_NAME, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def _open(self):
+        con = sqlite3.connect(self.path, check_same_thread=False,
+                              cached_statements=STATEMENT_CACHE)
+        for pragma in PRAGMAS:
+            con.execute(pragma)
+        return con
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.created < self.size:
+                self.created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._open()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+        return self.idle.get()
+
+    def release(self, con):
+        self.idle.put(con)
+
+    @contextmanager
+    def connection(self):
+        con = self.acquire()
+        try:
+            yield con
+        finally:
+            self.release(con)
+
+    def close(self):
+        with self.lock:
+            while True:
+                try:
+                    self.idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self.created -= 1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Спільний пул для запитів (створюється при першому зверненні)
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
 def init_db():
     con = connect()
     cur = con.cursor()
@@ -67,56 +158,75 @@ def init_db():
 
 # Вразливий пошук (пряме підставлення введення в SQL)
 def search_students_vulnerable(name_part: str):
-    con = connect()
-    cur = con.cursor()
     sql = f"SELECT id, full_name, group_name, phone FROM students WHERE full_name LIKE '%{name_part}%'"
     log_event(f"VULN search SQL = {sql}")
-    try:
-        cur.execute(sql)
-        rows = cur.fetchall()
-    finally:
-        con.close()
-    return rows
+    with get_pool().connection() as con:
+        return con.execute(sql).fetchall()
 
 # Захищений пошук (параметризований запит)
 def search_students_safe(name_part: str):
-    con = connect()
-    cur = con.cursor()
-    sql = "SELECT id, full_name, group_name, phone FROM students WHERE full_name LIKE ?"
     param = f"%{name_part}%"
-    log_event(f"SAFE search SQL = {sql} | param={param!r}")
-    try:
-        cur.execute(sql, (param,))
-        rows = cur.fetchall()
-    finally:
-        con.close()
-    return rows
+    log_event(f"SAFE search SQL = {SEARCH_SQL} | param={param!r}")
+    with get_pool().connection() as con:
+        return con.execute(SEARCH_SQL, (param,)).fetchall()
 
 # Вразлива авторизація
 def login_vulnerable(username: str, password: str):
-    con = connect()
-    cur = con.cursor()
     sql = f"SELECT username, role FROM users WHERE username='{username}' AND password='{password}'"
     log_event(f"VULN login SQL = {sql}")
-    try:
-        cur.execute(sql)
-        row = cur.fetchone()
-    finally:
-        con.close()
-    return row
+    with get_pool().connection() as con:
+        return con.execute(sql).fetchone()
 
 # Захищена авторизація
 def login_safe(username: str, password: str):
-    con = connect()
-    cur = con.cursor()
-    sql = "SELECT username, role FROM users WHERE username=? AND password=?"
-    log_event(f"SAFE login SQL = {sql} | params=({username!r}, {password!r})")
-    try:
-        cur.execute(sql, (username, password))
-        row = cur.fetchone()
-    finally:
-        con.close()
-    return row
+    log_event(f"SAFE login SQL = {LOGIN_SQL} | params=({username!r}, {password!r})")
+    with get_pool().connection() as con:
+        return con.execute(LOGIN_SQL, (username, password)).fetchone()
+
+# Запити кількома потоками протягом seconds секунд; результат - запитів/с
+def _measure_qps(run_query, threads: int, seconds: float) -> float:
+    deadline = time.perf_counter() + seconds
+
+    def worker(_):
+        count = 0
+        while time.perf_counter() < deadline:
+            run_query(count)
+            count += 1
+        return count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        total = sum(pool.map(worker, range(threads)))
+    return total / (time.perf_counter() - start)
+
+# Порівняння: нове з'єднання на кожен запит (як раніше) і пул з кешем запитів
+def benchmark_queries(threads=(1, 4, 8), seconds: float = 2.0):
+    init_db()
+    pool = ConnectionPool(size=max(threads))
+    names = ["Maryna", "Olha", "Teslenko", "122", "nobody"]
+
+    def per_call(sql, params):
+        con = connect()
+        try:
+            return con.execute(sql, params).fetchall()
+        finally:
+            con.close()
+
+    def pooled(sql, params):
+        with pool.connection() as con:
+            return con.execute(sql, params).fetchall()
+
+    queries = {
+        "пошук": (SEARCH_SQL, lambda i: (f"%{names[i % len(names)]}%",)),
+        "логін": (LOGIN_SQL, lambda i: ("admin", "admin123" if i % 2 else "wrong")),
+    }
+    print(f"{'Запит':<7} {'Потоків':>7} {'Нове з.-ня, q/s':>16} {'Пул, q/s':>10} {'Прискорення':>12}")
+    for label, (sql, params) in queries.items():
+        for count in threads:
+            before = _measure_qps(lambda i: per_call(sql, params(i)), count, seconds)
+            after = _measure_qps(lambda i: pooled(sql, params(i)), count, seconds)
+            print(f"{label:<7} {count:>7} {before:>16.0f} {after:>10.0f} {after / before:>11.1f}x")
+    pool.close()
 
 def print_rows(rows):
     if not rows:
@@ -173,4 +283,12 @@ def main():
             print("Невірна команда")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="SQL-ін'єкції: уразливі та захищені запити")
+    parser.add_argument("--bench", action="store_true",
+                        help="запитів/с: нове з'єднання на запит проти пулу з'єднань")
+    parser.add_argument("--seconds", type=float, default=2.0, help="тривалість кожного виміру")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark_queries(seconds=args.seconds)
+    else:
+        main()